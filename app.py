@@ -1,128 +1,166 @@
 
 import datetime
+import importlib
 
 import streamlit as st
 
 import db
-from modules import (
-    admin_dashboard,
-    admin_properties,
-    admin_price_master,
-    admin_personnel,
-    admin_events,
-    admin_reports,
-    admin_tickets,
-    owner_dashboard,
-    owner_tickets,
-    admin_quote_builder,
+
+_PAGE_CONFIG = dict(
+    page_title="Landscaping & Mowing Manager",
+    page_icon="🌳",
+    layout="wide",
 )
 
+# Page label -> module under ``modules/``. Modules are imported only when
+# their page is selected, so a rerun never pays for pages it doesn't render.
+ADMIN_PAGES = {
+    "Dashboard": "admin_dashboard",
+    "Quote Builder": "admin_quote_builder",
+    "Manage Properties & Services": "admin_properties",
+    "Price Master": "admin_price_master",
+    "Service Personnel": "admin_personnel",
+    "Event Scheduler": "admin_events",
+    "Reports": "admin_reports",
+    "Tickets": "admin_tickets",
+}
+
+OWNER_PAGES = {
+    "My Dashboard": "owner_dashboard",
+    "My Tickets": "owner_tickets",
+}
+
+# Landing pages for each role; imported while the login form is on screen.
+_WARMUP_MODULES = ("modules.admin_dashboard", "modules.owner_dashboard")
+
+
+@st.cache_resource(show_spinner=False)
+def _init_db_once() -> bool:
+    # Schema creation and seeding only need to happen once per server process,
+    # not on every rerun. init_db_once also survives cache clears from the
+    # dev-server file watcher.
+    db.init_db_once()
+    return True
 
-def main():
-    st.set_page_config(
-        page_title="Landscaping & Mowing Manager",
-        page_icon="🌳",
-        layout="wide",
-    )
 
-    db.init_db()
+def main():
+    st.set_page_config(**_PAGE_CONFIG)
 
-    if "user" not in st.session_state:
-        st.session_state.user = None
+    _init_db_once()
 
-    user = st.session_state.user
+    user = st.session_state.setdefault("user", None)
 
     if user is None:
         login_page()
+        _warm_up_imports()
     else:
-        if user["role"] == "admin":
-            admin_app(user)
-        else:
-            owner_app(user)
+        if "_sidebar_greeting" not in st.session_state:
+            _cache_sidebar(user)
+        ROLE_APPS.get(user["role"], owner_app)(user)
+
+
+def _warm_up_imports() -> None:
+    # Called after the login widgets are queued, so the form paints first and
+    # pandas & co. are imported while the user is typing.
+    for name in _WARMUP_MODULES:
+        importlib.import_module(name)
+
+
+def _cache_sidebar(user) -> None:
+    # Greeting and page table only change on login, so build them once per session.
+    st.session_state["_sidebar_greeting"] = (
+        f"Logged in as **{user.get('full_name') or user['username']}** ({user['role'].title()})"
+    )
+    st.session_state["_nav_pages"] = ADMIN_PAGES if user["role"] == "admin" else OWNER_PAGES
+
+
+def _clear_session_user() -> None:
+    st.session_state.user = None
+    st.session_state.pop("_sidebar_greeting", None)
+    st.session_state.pop("_nav_pages", None)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _lookup_user(username: str):
+    # Short TTL so password/role changes are picked up quickly. This sits on
+    # top of db's own user cache, so a change made outside this process can
+    # take up to this TTL plus db._USER_CACHE_TTL to show up.
+    return db.get_user_by_username(username)
+
+
+def _do_login() -> None:
+    # Button callback: runs before the rerun, so a successful login renders
+    # the app on the very next pass without an explicit st.rerun().
+    username = (st.session_state.get("login_username") or "").strip()
+    password = st.session_state.get("login_password") or ""
+    if not username or not password:
+        st.session_state["_login_error"] = "Please enter username and password."
+        return
+
+    user = _lookup_user(username)
+    if not user or not db.verify_password(password, user.get("password_hash")):
+        st.session_state["_login_error"] = "Invalid credentials."
+        return
+    if db.rehash_password_if_needed(user["id"], password, user.get("password_hash")):
+        _lookup_user.clear()
+
+    st.session_state.user = user
+    _cache_sidebar(user)
 
 
 def login_page():
     st.title("🌳 Landscaping & Mowing Portal")
     st.subheader("Login")
 
-    username = st.text_input("Username")
-    password = st.text_input("Password", type="password")
+    st.text_input("Username", key="login_username")
+    st.text_input("Password", type="password", key="login_password")
+    st.button("Login", on_click=_do_login)
+
+    error = st.session_state.pop("_login_error", None)
+    if error:
+        st.error(error)
+
+
+def _page(label: str, module_name: str, user, default: bool = False):
+    """Navigation entry whose module is only imported when the page is opened."""
+    def render():
+        importlib.import_module(f"modules.{module_name}").show(user)
 
-    if st.button("Login"):
-        if not username or not password:
-            st.error("Please enter username and password.")
-            return
+    return st.Page(render, title=label, url_path=module_name, default=default)
 
-        user = db.get_user_by_username(username.strip())
-        if not user or user["password"] != password:
-            st.error("Invalid credentials.")
-            return
 
-        st.session_state.user = user
-        st.success(f"Welcome, {user.get('full_name') or user['username']}!")
-        st.rerun()
+def _build_pages(pages, user):
+    return [
+        _page(label, module_name, user, default=(i == 0))
+        for i, (label, module_name) in enumerate(pages.items())
+    ]
 
 
 def admin_app(user):
-    st.sidebar.title("Admin Navigation")
-    choice = st.sidebar.radio(
-        "Go to",
-        [
-            "Dashboard",
-            "Quote Builder",
-            "Manage Properties & Services",
-            "Price Master",
-            "Service Personnel",
-            "Event Scheduler",
-            "Reports",
-            "Tickets",
-        ],
-    )
+    pg = st.navigation({"Admin Navigation": _build_pages(st.session_state["_nav_pages"], user)})
 
     st.sidebar.markdown("---")
-    st.sidebar.write(f"Logged in as **{user.get('full_name') or user['username']}** (Admin)")
-    if st.sidebar.button("Logout"):
-        st.session_state.user = None
-        st.rerun()
-
-    if choice == "Dashboard":
-        admin_dashboard.show(user)
-    elif choice == "Quote Builder":
-        admin_quote_builder.show(user)
-    elif choice == "Manage Properties & Services":
-        admin_properties.show(user)
-    elif choice == "Price Master":
-        admin_price_master.show(user)
-    elif choice == "Service Personnel":
-        admin_personnel.show(user)
-    elif choice == "Event Scheduler":
-        admin_events.show(user)
-    elif choice == "Reports":
-        admin_reports.show(user)
-    elif choice == "Tickets":
-        admin_tickets.show(user)
+    st.sidebar.write(st.session_state["_sidebar_greeting"])
+    st.sidebar.button("Logout", on_click=_clear_session_user)
+
+    pg.run()
 
 
 def owner_app(user):
-    st.sidebar.title("Owner Navigation")
-    choice = st.sidebar.radio(
-        "Go to",
-        [
-            "My Dashboard",
-            "My Tickets",
-        ],
-    )
+    pg = st.navigation({"Owner Navigation": _build_pages(st.session_state["_nav_pages"], user)})
 
     st.sidebar.markdown("---")
-    st.sidebar.write(f"Logged in as **{user.get('full_name') or user['username']}** (Owner)")
-    if st.sidebar.button("Logout"):
-        st.session_state.user = None
-        st.rerun()
-
-    if choice == "My Dashboard":
-        owner_dashboard.show(user)
-    elif choice == "My Tickets":
-        owner_tickets.show(user)
+    st.sidebar.write(st.session_state["_sidebar_greeting"])
+    st.sidebar.button("Logout", on_click=_clear_session_user)
+
+    pg.run()
+
+
+# Role -> app entry point; anything that isn't an admin gets the owner view.
+ROLE_APPS = {
+    "admin": admin_app,
+    "owner": owner_app,
+}
 
 
 if __name__ == "__main__":
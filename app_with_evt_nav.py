@@ -1,12 +1,41 @@
 import os
 import io
-from typing import Optional, Any, Dict, List
-
-import pandas as pd
+import hashlib
+import re
+import shutil
+import smtplib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+from typing import TYPE_CHECKING, Optional, Any, Dict, List, Tuple
+
+import numpy as np
 import streamlit as st
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 
+import cache_layer
 import db
 from datetime import date
+from utils.config import get_secret
+
+# pandas is imported inside the branches that build DataFrames, so reruns
+# that only touch forms never pay for it.
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Optional integrations: resolved once here instead of on every call.
+try:
+    import google.generativeai as _genai  # type: ignore
+except ImportError:
+    _genai = None
+
+try:
+    from twilio.rest import Client as TwilioClient  # type: ignore
+except ImportError:  # SMS is optional
+    TwilioClient = None
 
 
 # ---------- Page Config & Init ----------
@@ -35,6 +64,7 @@ def login(username: str, password: str) -> bool:
         return False
     if not db.verify_password(password, user_row["password_hash"]):
         return False
+    db.rehash_password_if_needed(user_row["id"], password, user_row["password_hash"])
 
     st.session_state.user = {
         "id": user_row["id"],
@@ -42,8 +72,8 @@ def login(username: str, password: str) -> bool:
         "full_name": user_row["full_name"],
         "role": user_row["role"],
         "property_id": user_row["property_id"],
-        "email": user_row["email"],
-        "phone": user_row["phone"],
+        "email": user_row.get("email"),
+        "phone": user_row.get("phone"),
     }
     return True
 
@@ -55,19 +85,20 @@ def logout():
 
 # ---------- Email / SMS Notification Helpers ----------
 
-def _get_secret(name: str) -> Optional[str]:
-    """Helper to read from st.secrets or environment."""
-    try:
-        val = st.secrets.get(name)  # type: ignore[attr-defined]
-        if val:
-            return str(val)
-    except Exception:
-        pass
-    return os.getenv(name)
+# Memoized in utils.config: this script is re-executed on every rerun, so a
+# cache defined here would be rebuilt (and empty) each time.
+_get_secret = get_secret
 
 
 def send_email_notification(to_email: str, subject: str, body: str) -> str:
-    """Send email using SMTP settings from secrets/env.
+    """Send a single email; see send_emails_bulk for the SMTP settings."""
+    return send_emails_bulk([(to_email, subject, body)])
+
+
+def send_emails_bulk(messages: List[Tuple[str, str, str]]) -> str:
+    """Send (to_email, subject, body) messages over one SMTP connection.
+
+    STARTTLS and login happen once per batch rather than once per recipient.
 
     Required config (in Streamlit secrets or env):
       - SMTP_HOST
@@ -88,26 +119,38 @@ def send_email_notification(to_email: str, subject: str, body: str) -> str:
 
     if not (smtp_host and smtp_port and smtp_username and smtp_password and smtp_from):
         return "Email not sent: SMTP not configured."
+    if not messages:
+        return "Email not sent: no recipients."
 
     try:
-        import smtplib
-        from email.mime.text import MIMEText
-
-        msg = MIMEText(body)
-        msg["Subject"] = subject
-        msg["From"] = smtp_from
-        msg["To"] = to_email
-
         with smtplib.SMTP(smtp_host, int(smtp_port)) as server:
             if smtp_use_tls:
                 server.starttls()
             server.login(smtp_username, smtp_password)
-            server.send_message(msg)
+            # Owners of a property all get the same subject/body: encode that
+            # once and only swap the To header per recipient.
+            templates: Dict[Tuple[str, str], MIMEText] = {}
+            for to_email, subject, body in messages:
+                msg = templates.get((subject, body))
+                if msg is None:
+                    msg = MIMEText(body)
+                    msg["Subject"] = subject
+                    msg["From"] = smtp_from
+                    templates[(subject, body)] = msg
+                del msg["To"]
+                msg["To"] = to_email
+                server.send_message(msg)
         return "Email sent"
     except Exception as e:
         return f"Email error: {e}"
 
 
+@st.cache_resource(show_spinner=False)
+def _twilio_client(account_sid: str, auth_token: str):
+    """One Twilio client per credential pair, so its HTTP session is reused."""
+    return TwilioClient(account_sid, auth_token)
+
+
 def send_sms_notification(to_number: str, body: str) -> str:
     """Send SMS via Twilio (optional).
 
@@ -122,11 +165,11 @@ def send_sms_notification(to_number: str, body: str) -> str:
 
     if not (account_sid and auth_token and from_number):
         return "SMS not sent: Twilio not configured."
+    if TwilioClient is None:
+        return "SMS not sent: twilio package not installed."
 
     try:
-        from twilio.rest import Client  # type: ignore
-
-        client = Client(account_sid, auth_token)
+        client = _twilio_client(account_sid, auth_token)
         client.messages.create(
             body=body,
             from_=from_number,
@@ -137,6 +180,31 @@ def send_sms_notification(to_number: str, body: str) -> str:
         return f"SMS error: {e}"
 
 
+@st.cache_resource(show_spinner=False)
+def _notify_pool() -> ThreadPoolExecutor:
+    """Background workers for owner notifications.
+
+    Cached as a resource because Streamlit re-executes this script on every
+    rerun; a plain module global would spawn a new pool each time.
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="notify")
+
+
+# Messages per SMTP connection when fanning a batch out over the pool
+EMAILS_PER_CONNECTION = 25
+
+
+def _submit_email_batches(messages: List[Tuple[str, str, str]]) -> None:
+    """Send a batch on the notify pool, one SMTP connection per chunk.
+
+    Small batches stay on a single connection; large ones are split so up to
+    the pool's worker count deliver in parallel.
+    """
+    pool = _notify_pool()
+    for i in range(0, len(messages), EMAILS_PER_CONNECTION):
+        pool.submit(send_emails_bulk, messages[i:i + EMAILS_PER_CONNECTION])
+
+
 def notify_owners_service_status_change(
     property_id: int,
     service: Dict[str, Any],
@@ -144,7 +212,11 @@ def notify_owners_service_status_change(
     send_email: bool,
     send_sms: bool,
 ):
-    """Notify property owners when admin updates a service status."""
+    """Notify property owners when admin updates a service status.
+
+    Delivery runs on a background pool so the admin's save doesn't wait on
+    SMTP/Twilio round-trips.
+    """
     owners = db.get_owners_for_property(property_id)
     if not owners:
         return
@@ -168,15 +240,18 @@ def notify_owners_service_status_change(
         f"Landscaping & Mowing Admin\n"
     )
 
+    if send_email:
+        emails = [(owner["email"], subject, body) for owner in owners if owner.get("email")]
+        if emails:
+            _submit_email_batches(emails)
+
     for owner in owners:
-        if send_email and owner["email"]:
-            send_email_notification(owner["email"], subject, body)
-        if send_sms and owner["phone"]:
+        if send_sms and owner.get("phone"):
             sms_text = (
                 f"{prop_name}: {service_desc} status -> {new_status}. "
                 "Check your dashboard for details."
             )
-            send_sms_notification(owner["phone"], sms_text)
+            _notify_pool().submit(send_sms_notification, owner["phone"], sms_text)
 
 
 # ---------- Gemini Integration (with simple RAG) ----------
@@ -211,35 +286,36 @@ def build_chat_context(user: Optional[Dict[str, Any]]) -> str:
     """Build a text context from the DB for Gemini (simple RAG)."""
     if not user:
         return ""
+    return _cached_context(user.get("id"), user.get("role"), user.get("property_id"))
+
 
-    role = user.get("role")
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_context(user_id: Optional[int], role: Optional[str], property_id: Optional[int]) -> str:
     if role == "admin":
         # Admin sees overview of all properties
-        props_summary = db.get_properties_summary()
+        props_summary = cache_layer.cached_properties_summary()
         lines: List[str] = []
         lines.append("SYSTEM DATA: Properties overview:")
-        for p in props_summary:
-            lines.append(
-                f"- {p['name']}: total_services={p['total_services']}, "
-                f"total_cost={p['total_cost']:.2f} USD"
-            )
+        lines.extend(
+            f"- {p['name']}: total_services={p['total_services']}, "
+            f"total_cost={p['total_cost']:.2f} USD"
+            for p in props_summary
+        )
         # Add frequency breakdown
-        freq_summary = db.get_frequency_summary()
+        freq_summary = cache_layer.cached_frequency_summary()
         if freq_summary:
             lines.append("\nService frequency summary (all properties):")
-            for f in freq_summary:
-                lines.append(
-                    f"- {f['frequency']}: total_services={f['total_services']}"
-                )
+            lines.extend(
+                f"- {f['frequency']}: total_services={f['total_services']}" for f in freq_summary
+            )
         return "\n".join(lines)
 
     # Owner role – context only for their property
-    property_id = user.get("property_id")
     if not property_id:
         return ""
-    prop = db.get_property_by_id(property_id)
-    summary = db.get_property_summary(property_id)
-    services = db.get_services_for_property(property_id)
+    bundle = db.get_owner_context_bundle(property_id)
+    prop = bundle["property"]
+    services = bundle["services"]
 
     lines = []
     if prop:
@@ -248,22 +324,28 @@ def build_chat_context(user: Optional[Dict[str, Any]]) -> str:
             f"{prop['state']} {prop['zip']}."
         )
     lines.append(
-        f"Summary: total_services={summary['total_services']}, "
-        f"total_cost={summary['total_cost']:.2f} USD."
+        f"Summary: total_services={bundle['total_services']}, "
+        f"total_cost={bundle['total_cost']:.2f} USD."
     )
     if services:
         lines.append("Services configured for this property:")
-        for s in services:
-            total_cost = s["times_per_year"] * s["each_time_cost"]
-            lines.append(
-                f"- {s['category']} ({s['frequency']}), status={s.get('status','Scheduled')}: "
-                f"times_per_year={s['times_per_year']}, "
-                f"each_time_cost={s['each_time_cost']:.2f}, "
-                f"total_cost={total_cost:.2f}"
-            )
+        lines.extend(
+            f"- {s['category']} ({s['frequency']}), status={s.get('status','Scheduled')}: "
+            f"times_per_year={s['times_per_year']}, "
+            f"each_time_cost={s['each_time_cost']:.2f}, "
+            f"total_cost={s['total_cost']:.2f}"
+            for s in services
+        )
     return "\n".join(lines)
 
 
+@st.cache_resource(show_spinner=False)
+def _get_gemini_model(api_key: str):
+    """Configure the Gemini client once per process (per API key)."""
+    _genai.configure(api_key=api_key)
+    return _genai.GenerativeModel("gemini-1.5-pro")
+
+
 def call_gemini_backend(prompt: str) -> str:
     """Call Gemini API with the given prompt, if configured."""
     api_key = get_gemini_api_key()
@@ -273,18 +355,67 @@ def call_gemini_backend(prompt: str) -> str:
             "Add GOOGLE_API_KEY to Streamlit secrets or environment variables "
             "to enable AI answers."
         )
+    if _genai is None:
+        return "⚠️ google-generativeai is not installed, so AI answers are unavailable."
 
     try:
-        import google.generativeai as genai
-
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-pro")
-        response = model.generate_content(prompt)
+        response = _get_gemini_model(api_key).generate_content(prompt)
         return response.text
     except Exception as e:
         return f"❌ Error calling Gemini API: {e}"
 
 
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _normalize_question(text: str) -> str:
+    """Lower-cased words only, so spacing, case and punctuation don't matter."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+class _AnswerCache:
+    """Reuse Gemini replies for repeated questions asked over the same context.
+
+    A reply is only reused when the normalised question matches exactly and
+    the RAG context is identical; questions differing in a single word
+    ("mowing" vs "mulch") must not share an answer.
+    """
+
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+    @staticmethod
+    def _key(context: str, question: str) -> Tuple[str, str]:
+        return hashlib.sha256(context.encode("utf-8")).hexdigest(), _normalize_question(question)
+
+    def lookup(self, context: str, question: str) -> Optional[str]:
+        key = self._key(context, question)
+        with self._lock:
+            reply = self._entries.get(key)
+            if reply is not None:
+                self._entries.move_to_end(key)
+            return reply
+
+    def store(self, context: str, question: str, reply: str) -> None:
+        key = self._key(context, question)
+        with self._lock:
+            self._entries[key] = reply
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+@st.cache_resource(show_spinner=False)
+def _gemini_answer_cache() -> _AnswerCache:
+    return _AnswerCache()
+
+
+# Messages kept in the on-screen chat (user + assistant turns combined)
+CHAT_HISTORY_LIMIT = 20
+
+
 def render_chat(user: Optional[Dict[str, Any]] = None):
     st.subheader("💬 Ask AI about your properties")
     st.caption(
@@ -320,255 +451,297 @@ def render_chat(user: Optional[Dict[str, Any]] = None):
 
         # Assistant message
         with st.chat_message("assistant"):
-            with st.spinner("Thinking with Gemini..."):
-                reply = call_gemini_backend(full_prompt)
+            answer_cache = _gemini_answer_cache()
+            reply = answer_cache.lookup(context, user_input)
+            if reply is None:
+                with st.spinner("Thinking with Gemini..."):
+                    reply = call_gemini_backend(full_prompt)
+                # Don't pin configuration/API errors in the cache
+                if not reply.startswith(("⚠️", "❌")):
+                    answer_cache.store(context, user_input, reply)
             st.markdown(reply)
         st.session_state.chat_history.append(
             {"role": "assistant", "content": reply}
         )
+        st.session_state.chat_history = st.session_state.chat_history[-CHAT_HISTORY_LIMIT:]
 
 
 # ---------- Excel Export Helpers ----------
 
-def generate_property_excel(property_id: int) -> io.BytesIO:
-    """Create an Excel file for a single property (Summary + Services)."""
-    prop = db.get_property_by_id(property_id)
-    summary = db.get_property_summary(property_id)
-    services = db.get_services_for_property(property_id)
+_MONEY_FORMAT = "$#,##0.00"
+_PERCENT_FORMAT = '0.00"%"'
+_HEADER_FONT = Font(bold=True)
 
-    # Convert sqlite3.Row to plain dict for safe .get() usage
-    prop_dict = dict(prop) if prop is not None else None
 
-    output = io.BytesIO()
+def _append_header(ws, labels: List[str]) -> None:
+    """Append a bold header row to a write-only worksheet."""
+    cells = []
+    for label in labels:
+        cell = WriteOnlyCell(ws, value=label)
+        cell.font = _HEADER_FONT
+        cells.append(cell)
+    ws.append(cells)
 
-    try:
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            # Summary sheet (always create at least one sheet)
-            if prop_dict is not None:
-                summary_row = {
-                    "Property ID": prop_dict.get("id", property_id),
-                    "Property Name": prop_dict.get("name", "Unknown"),
-                    "Address": prop_dict.get("address", ""),
-                    "City": prop_dict.get("city", ""),
-                    "State": prop_dict.get("state", ""),
-                    "ZIP": prop_dict.get("zip", ""),
-                    "Total Services (No. of Times)": summary["total_services"] if summary else 0,
-                    "Total Annual Cost": summary["total_cost"] if summary else 0.0,
-                }
-            else:
-                summary_row = {
-                    "Property ID": property_id,
-                    "Property Name": "Unknown",
-                    "Address": "",
-                    "City": "",
-                    "State": "",
-                    "ZIP": "",
-                    "Total Services (No. of Times)": 0,
-                    "Total Annual Cost": 0.0,
-                }
-
-            df_summary = pd.DataFrame([summary_row])
-            df_summary.to_excel(writer, index=False, sheet_name="Summary")
-
-            # Services sheet (optional)
-            if services:
-                services = [dict(s) for s in services]
-                df_services = pd.DataFrame(services)
-                df_services["Total Cost"] = df_services["times_per_year"] * df_services["each_time_cost"]
-                df_services = df_services.rename(
-                    columns={
-                        "category": "Category",
-                        "frequency": "Frequency",
-                        "times_per_year": "No. of Times",
-                        "each_time_cost": "Each Time Cost",
-                        "status": "Status",
-                        "start_date": "Start Date",
-                        "end_date": "End Date",
-                        "Total Cost": "Total Cost",
-                    }
-                )
-                df_services.to_excel(writer, index=False, sheet_name="Services")
-    except Exception as e:
-        # Fallback: ensure we always have at least one visible sheet
-        from openpyxl import Workbook
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Summary"
+def _append_row(ws, values, number_formats: Optional[Dict[int, str]] = None) -> None:
+    """Append one row; columns listed in ``number_formats`` get that format."""
+    if not number_formats:
+        ws.append(tuple(values))
+        return
+    row = list(values)
+    for idx, num_format in number_formats.items():
+        cell = WriteOnlyCell(ws, value=row[idx])
+        cell.number_format = num_format
+        row[idx] = cell
+    ws.append(row)
+
+
+_SERVICE_SHEET_LABELS = {
+    "category": "Category",
+    "frequency": "Frequency",
+    "times_per_year": "No. of Times",
+    "each_time_cost": "Each Time Cost",
+    "status": "Status",
+    "start_date": "Start Date",
+    "end_date": "End Date",
+    "total_cost": "Total Cost",
+}
+
+
+def generate_property_excel(property_id: int) -> io.BytesIO:
+    """Create an Excel file for a single property (Summary + Services).
+
+    One summary row and a short services table don't need pandas; rows are
+    streamed straight into a write-only openpyxl workbook.
+    """
+    prop = cache_layer.cached_property(property_id)
+    summary = cache_layer.cached_property_summary(property_id)
+    services = cache_layer.cached_services(property_id)
+
+    wb = Workbook(write_only=True)
+
+    # Summary sheet (always create at least one sheet)
+    ws = wb.create_sheet("Summary")
+    ws.append(
+        [
+            "Property ID",
+            "Property Name",
+            "Address",
+            "City",
+            "State",
+            "ZIP",
+            "Total Services (No. of Times)",
+            "Total Annual Cost",
+        ]
+    )
+    if prop is not None:
         ws.append(
             [
-                "Property ID",
-                "Property Name",
-                "Address",
-                "City",
-                "State",
-                "ZIP",
-                "Total Services (No. of Times)",
-                "Total Annual Cost",
+                prop.get("id", property_id),
+                prop.get("name", "Unknown"),
+                prop.get("address", ""),
+                prop.get("city", ""),
+                prop.get("state", ""),
+                prop.get("zip", ""),
+                summary["total_services"] if summary else 0,
+                summary["total_cost"] if summary else 0.0,
             ]
         )
-        if prop_dict is not None:
-            ws.append(
-                [
-                    prop_dict.get("id", property_id),
-                    prop_dict.get("name", "Unknown"),
-                    prop_dict.get("address", ""),
-                    prop_dict.get("city", ""),
-                    prop_dict.get("state", ""),
-                    prop_dict.get("zip", ""),
-                    summary["total_services"] if summary else 0,
-                    summary["total_cost"] if summary else 0.0,
-                ]
-            )
-        else:
-            ws.append(
-                [property_id, "Unknown", "", "", "", "", 0, 0.0]
-            )
-        output.seek(0)
-        wb.save(output)
+    else:
+        ws.append([property_id, "Unknown", "", "", "", "", 0, 0.0])
 
+    # Services sheet (optional)
+    if services:
+        columns = list(services[0].keys())
+        ws_services = wb.create_sheet("Services")
+        ws_services.append([_SERVICE_SHEET_LABELS.get(c, c) for c in columns])
+        for s in services:
+            ws_services.append([s[c] for c in columns])
+
+    output = io.BytesIO()
+    wb.save(output)
     output.seek(0)
     return output
 
 
+@st.cache_data(ttl=300, show_spinner=False)
+def generate_property_excel_cached(property_id: int, version_token: str) -> bytes:
+    """Workbook bytes for a property; version_token changes whenever its data does."""
+    return generate_property_excel(property_id).getvalue()
+
+
+def _property_excel_bytes(property_id: int) -> bytes:
+    prop = cache_layer.cached_property(property_id) or {}
+    summary = cache_layer.cached_property_summary(property_id)
+    version_token = str(
+        (prop.get("updated_at"), summary["total_services"], summary["total_cost"])
+    )
+    return generate_property_excel_cached(property_id, version_token)
+
+
+def _invalidate_property_data() -> None:
+    """Call after any property/service write so cached reads and exports refresh."""
+    cache_layer.clear_property_caches()
+    generate_property_excel_cached.clear()
+    generate_consolidated_excel_cached.clear()
+    _cached_context.clear()
+    _service_options.clear()
+
+
+def _properties_summary_frame(rows: List[Dict[str, Any]]) -> "pd.DataFrame":
+    """Per-property financials with margin and ROI, built column-wise."""
+    import pandas as pd
+
+    df = pd.DataFrame(
+        {
+            "Property ID": [r["id"] for r in rows],
+            "Property Name": [r["name"] for r in rows],
+            "Total Services (No. of Times)": [r["total_services"] for r in rows],
+            "Total Annual Cost": [r["total_cost"] for r in rows],
+            "Annual Quoted Revenue": [r.get("annual_quote", 0.0) for r in rows],
+            "Annual Credited Revenue": [r.get("annual_credited", 0.0) for r in rows],
+        }
+    ).astype(
+        {
+            "Total Annual Cost": "float64",
+            "Annual Quoted Revenue": "float64",
+            "Annual Credited Revenue": "float64",
+        }
+    )
+    df["Credited Margin"] = df["Annual Credited Revenue"] - df["Total Annual Cost"]
+    cost = df["Total Annual Cost"].to_numpy()
+    margin = df["Credited Margin"].to_numpy()
+    df["Credited ROI %"] = np.where(cost > 0, margin / np.where(cost > 0, cost, 1.0) * 100.0, np.nan)
+    return df
+
+
+_CHART_TOP_N = 20
+
+
+def _top_cost_chart_frame(df: "pd.DataFrame") -> "pd.DataFrame":
+    """The most expensive properties only, so large portfolios chart quickly."""
+    return df.nlargest(_CHART_TOP_N, "Total Annual Cost").set_index("Property Name")[
+        ["Total Annual Cost"]
+    ]
 
 
 def generate_consolidated_excel() -> io.BytesIO:
-    """Create a consolidated Excel with property summary, services, owners, and tickets."""
-    props_summary = db.get_properties_summary()
-    owners = db.list_users(role="owner")
-    services = db.get_all_services_with_property()
-    tickets = db.list_all_tickets()
+    """Create a consolidated Excel with property summary, services, owners, and tickets.
 
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        # Property summary
-        if props_summary:
-            df_props = pd.DataFrame(
-                [
-                    {
-                        "Property ID": r["id"],
-                        "Property Name": r["name"],
-                        "Total Services (No. of Times)": r["total_services"],
-                        "Total Annual Cost": r["total_cost"],
-                        "Annual Quoted Revenue": r.get("annual_quote", 0.0),
-                        "Annual Credited Revenue": r.get("annual_credited", 0.0),
-                    }
-                    for r in props_summary
-                ]
-            )
-            df_props["Credited Margin"] = df_props["Annual Credited Revenue"] - df_props["Total Annual Cost"]
-            df_props["Credited ROI %"] = df_props.apply(
-                lambda row: ((row["Credited Margin"] / row["Total Annual Cost"]) * 100.0)
-                if row["Total Annual Cost"] > 0
-                else None,
-                axis=1,
-            )
-            df_props.to_excel(writer, index=False, sheet_name="Property Summary")
-
-        # Services
-        if services:
-            df_services = pd.DataFrame(services)
-            df_services["total_cost"] = df_services["times_per_year"] * df_services["each_time_cost"]
-            df_services = df_services.rename(
-                columns={
-                    "property_name": "Property Name",
-                    "category": "Category",
-                    "frequency": "Frequency",
-                    "times_per_year": "No. of Times",
-                    "each_time_cost": "Each Time Cost",
-                    "status": "Status",
-                    "total_cost": "Total Cost",
-                }
-            )
-            df_services.to_excel(writer, index=False, sheet_name="Services")
-
-        # Owners
-        if owners:
-            df_owners = pd.DataFrame(owners)
-            df_owners = df_owners.rename(
-                columns={
-                    "username": "Username",
-                    "full_name": "Full Name",
-                    "email": "Email",
-                    "phone": "Phone",
-                    "role": "Role",
-                    "property_name": "Property Name",
-                }
-            )
-            df_owners = df_owners[
-                ["Username", "Full Name", "Email", "Phone", "Role", "Property Name"]
-            ]
-            df_owners.to_excel(writer, index=False, sheet_name="Owners")
-
-        # Tickets
-        if tickets:
-            df_tickets = pd.DataFrame(tickets)
-            df_tickets = df_tickets.rename(
-                columns={
-                    "id": "Ticket ID",
-                    "title": "Title",
-                    "description": "Description",
-                    "status": "Status",
-                    "created_at": "Created At",
-                    "updated_at": "Updated At",
-                    "admin_comment": "Admin Comment",
-                    "property_name": "Property Name",
-                    "owner_username": "Owner Username",
-                }
+    Uses a write-only workbook so rows are serialised as they are appended;
+    services are streamed from the database in batches rather than loaded
+    into one list first.
+    """
+    props_summary = cache_layer.cached_properties_summary()
+    owners = cache_layer.cached_users("owner")
+    tickets = cache_layer.cached_all_tickets()
+
+    wb = Workbook(write_only=True)
+
+    # Property summary
+    if props_summary:
+        df_props = _properties_summary_frame(props_summary)
+        ws = wb.create_sheet("Property Summary")
+        _append_header(ws, list(df_props.columns))
+        formats = {3: _MONEY_FORMAT, 4: _MONEY_FORMAT, 5: _MONEY_FORMAT, 6: _MONEY_FORMAT, 7: _PERCENT_FORMAT}
+        for row in df_props.itertuples(index=False, name=None):
+            roi = row[7]
+            _append_row(ws, row[:7] + (None if np.isnan(roi) else roi,), formats)
+
+    # Services
+    service_columns = [
+        ("id", "Service ID"),
+        ("property_name", "Property Name"),
+        ("category", "Category"),
+        ("frequency", "Frequency"),
+        ("times_per_year", "No. of Times"),
+        ("each_time_cost", "Each Time Cost"),
+        ("total_cost", "Total Cost"),
+        ("status", "Status"),
+        ("notes", "Notes"),
+    ]
+    ws = None
+    for row in db.iter_services_with_property():
+        if ws is None:
+            ws = wb.create_sheet("Services")
+            keys = set(row.keys())
+            service_columns = [(c, label) for c, label in service_columns if c in keys]
+            names = [c for c, _ in service_columns]
+            formats = {
+                names.index(c): _MONEY_FORMAT
+                for c in ("each_time_cost", "total_cost")
+                if c in names
+            }
+            _append_header(ws, [label for _, label in service_columns])
+        _append_row(ws, (row[c] for c, _ in service_columns), formats)
+
+    # Owners
+    if owners:
+        ws = wb.create_sheet("Owners")
+        _append_header(ws, ["Username", "Full Name", "Email", "Phone", "Role", "Property Name"])
+        for o in owners:
+            ws.append(
+                (
+                    o.get("username"),
+                    o.get("full_name"),
+                    o.get("email"),
+                    o.get("phone"),
+                    o.get("role"),
+                    o.get("property_name"),
+                )
             )
-            df_tickets.to_excel(writer, index=False, sheet_name="Tickets")
 
-    output.seek(0)
-    return output
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        # Summary sheet
-        if prop:
-            summary_rows = [
-                {"Metric": "Property Name", "Value": prop["name"]},
-                {"Metric": "Address", "Value": prop["address"]},
-                {
-                    "Metric": "City/State/ZIP",
-                    "Value": f"{prop['city']}, {prop['state']} {prop['zip']}",
-                },
-                {"Metric": "Total Services", "Value": summary["total_services"]},
-                {
-                    "Metric": "Total Annual Cost (USD)",
-                    "Value": f"{summary['total_cost']:.2f}",
-                },
-            ]
-        else:
-            summary_rows = [
-                {"Metric": "Total Services", "Value": summary["total_services"]},
-                {
-                    "Metric": "Total Annual Cost (USD)",
-                    "Value": f"{summary['total_cost']:.2f}",
-                },
-            ]
-        summary_df = pd.DataFrame(summary_rows)
-        summary_df.to_excel(writer, index=False, sheet_name="Summary")
-
-        # Services sheet
-        if services:
-            svc_df = pd.DataFrame(services)
-            svc_df["total_cost"] = svc_df["times_per_year"] * svc_df["each_time_cost"]
-            svc_df = svc_df.rename(
-                columns={
-                    "category": "Category",
-                    "frequency": "Frequency",
-                    "times_per_year": "No. of Times",
-                    "each_time_cost": "Each Time Cost",
-                    "total_cost": "Total Cost",
-                    "status": "Status",
-                }
+    # Tickets
+    if tickets:
+        ws = wb.create_sheet("Tickets")
+        _append_header(
+            ws,
+            [
+                "Ticket ID",
+                "Title",
+                "Description",
+                "Status",
+                "Created At",
+                "Updated At",
+                "Admin Comment",
+                "Property Name",
+                "Owner Username",
+            ],
+        )
+        for t in tickets:
+            ws.append(
+                (
+                    t.get("id"),
+                    t.get("title", t.get("subject")),
+                    t.get("description"),
+                    t.get("status"),
+                    t.get("created_at"),
+                    t.get("updated_at"),
+                    t.get("admin_comment"),
+                    t.get("property_name"),
+                    t.get("owner_username"),
+                )
             )
-            svc_df.to_excel(writer, index=False, sheet_name="Services")
 
+    if not wb.worksheets:
+        wb.create_sheet("Property Summary")
+
+    output = io.BytesIO()
+    wb.save(output)
     output.seek(0)
     return output
 
 
+@st.cache_data(ttl=300, max_entries=16, show_spinner=False)
+def generate_consolidated_excel_cached(version_token: str) -> bytes:
+    """Consolidated workbook bytes; version_token changes whenever the report data does."""
+    return generate_consolidated_excel().getvalue()
+
+
+def _consolidated_excel_bytes() -> bytes:
+    return generate_consolidated_excel_cached(db.get_report_data_version())
+
+
 # ---------- UI Sections ----------
 
 def login_page():
@@ -603,80 +776,56 @@ def admin_dashboard(user: Dict[str, Any]):
     st.title("📊 Admin Dashboard")
 
     # Summary by property
-    rows = db.get_properties_summary()
+    rows = cache_layer.cached_properties_summary()
     if not rows:
         st.warning("No properties found yet.")
         return
 
-    df = pd.DataFrame(
-        [
-            {
-                "Property ID": r["id"],
-                "Property Name": r["name"],
-                "Total Services (No. of Times)": r["total_services"],
-                "Total Annual Cost": r["total_cost"],
-                "Annual Quoted Revenue": r.get("annual_quote", 0.0),
-                "Annual Credited Revenue": r.get("annual_credited", 0.0),
-            }
-            for r in rows
-        ]
-    )
+    import pandas as pd
 
-    # Derived financial metrics
-    df["Credited Margin"] = df["Annual Credited Revenue"] - df["Total Annual Cost"]
-    df["Credited ROI %"] = df.apply(
-        lambda row: ((row["Credited Margin"] / row["Total Annual Cost"]) * 100.0)
-        if row["Total Annual Cost"] > 0
-        else None,
-        axis=1,
-    )
+    # Includes derived margin and ROI columns
+    df = _properties_summary_frame(rows)
 
-    total_services = int(df["Total Services (No. of Times)"].sum())
-    total_cost = float(df["Total Annual Cost"].sum()) if not df.empty else 0.0
-    total_quoted = float(df["Annual Quoted Revenue"].sum()) if not df.empty else 0.0
-    total_credited = float(df["Annual Credited Revenue"].sum()) if not df.empty else 0.0
-    total_margin = total_credited - total_cost
+    totals = cache_layer.cached_portfolio_totals()
 
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Properties", len(df))
+        st.metric("Total Properties", totals["total_properties"])
     with col2:
-        st.metric("Total Services (All Properties)", total_services)
+        st.metric("Total Services (All Properties)", int(totals["total_services"]))
     with col3:
-        st.metric("Total Annual Cost", f"${total_cost:,.2f}")
+        st.metric("Total Annual Cost", f"${totals['total_cost']:,.2f}")
 
     col4, col5, col6 = st.columns(3)
     with col4:
-        st.metric("Total Quoted Revenue (All Properties)", f"${total_quoted:,.2f}")
+        st.metric("Total Quoted Revenue (All Properties)", f"${totals['total_quoted']:,.2f}")
     with col5:
-        st.metric("Total Credited Revenue (All Properties)", f"${total_credited:,.2f}")
+        st.metric("Total Credited Revenue (All Properties)", f"${totals['total_credited']:,.2f}")
     with col6:
-        st.metric("Total Portfolio Margin (Credited - Cost)", f"${total_margin:,.2f}")
+        st.metric("Total Portfolio Margin (Credited - Cost)", f"${totals['total_margin']:,.2f}")
 
     st.markdown("### Properties Overview")
     st.dataframe(
-        df.style.format(
-            {
-                "Total Annual Cost": "${:,.2f}".format,
-                "Annual Quoted Revenue": "${:,.2f}".format,
-                "Annual Credited Revenue": "${:,.2f}".format,
-                "Credited Margin": "${:,.2f}".format,
-                "Credited ROI %": "{:,.2f}%".format,
-            }
-        ),
+        df,
+        column_config={
+            "Total Annual Cost": st.column_config.NumberColumn(format="$%.2f"),
+            "Annual Quoted Revenue": st.column_config.NumberColumn(format="$%.2f"),
+            "Annual Credited Revenue": st.column_config.NumberColumn(format="$%.2f"),
+            "Credited Margin": st.column_config.NumberColumn(format="$%.2f"),
+            "Credited ROI %": st.column_config.NumberColumn(format="%.2f%%"),
+        },
         use_container_width=True,
     )
 
     # Charts
     col_left, col_right = st.columns(2)
     with col_left:
-        st.markdown("#### Annual Cost per Property")
-        chart_df = df.set_index("Property Name")[["Total Annual Cost"]]
-        st.bar_chart(chart_df)
+        st.markdown(f"#### Annual Cost per Property (top {_CHART_TOP_N})")
+        st.bar_chart(_top_cost_chart_frame(df))
 
     with col_right:
         st.markdown("#### Total Services by Frequency (All Properties)")
-        freq_rows = db.get_frequency_summary()
+        freq_rows = cache_layer.cached_frequency_summary()
         if freq_rows:
             freq_df = pd.DataFrame(freq_rows)
             freq_df = freq_df.set_index("frequency")
@@ -688,197 +837,118 @@ def admin_dashboard(user: Dict[str, Any]):
     render_chat(user)
 
 
-def admin_manage_properties(user: Dict[str, Any]):
-    st.title("🏠 Manage Properties & Services")
+# Leading bytes of the image formats the attachment uploader accepts
+_IMAGE_SIGNATURES = (b"\x89PNG", b"\xff\xd8\xff")
 
-    # --- Add New Property ---
-    with st.expander("➕ Add New Property"):
-        with st.form("add_property_form"):
-            col_np1, col_np2 = st.columns(2)
-            with col_np1:
-                new_name = st.text_input("Property Name")
-                new_address = st.text_input("Address")
-            with col_np2:
-                new_city = st.text_input("City")
-                new_state = st.text_input("State", value="TX")
-                new_zip = st.text_input("ZIP")
-            col_rf1, col_rf2 = st.columns(2)
-            with col_rf1:
-                new_annual_quote = st.number_input(
-                    "Annual Quoted Revenue (USD)",
-                    min_value=0.0,
-                    max_value=10000000.0,
-                    value=0.0,
-                    step=100.0,
-                )
-            with col_rf2:
-                new_annual_credited = st.number_input(
-                    "Annual Credited Revenue (USD)",
-                    min_value=0.0,
-                    max_value=10000000.0,
-                    value=0.0,
-                    step=100.0,
-                )
-            submit_prop = st.form_submit_button("Create Property", type="primary")
-            if submit_prop:
-                if not new_name:
-                    st.error("Property name is required.")
-                else:
-                    db.add_property(
-                        new_name,
-                        new_address,
-                        new_city,
-                        new_state,
-                        new_zip,
-                        float(new_annual_quote),
-                        float(new_annual_credited),
-                    )
-                    st.success("Property created.")
-                    st.rerun()
 
-    # --- Select / Edit Property ---
-    properties = db.get_all_properties()
-    if not properties:
-        st.warning("No properties found. Create one using 'Add New Property'.")
-        return
+def _is_image_upload(f) -> bool:
+    """Check the upload's magic bytes without reading the whole buffer."""
+    f.seek(0)
+    head = f.read(8)
+    f.seek(0)
+    return head.startswith(_IMAGE_SIGNATURES)
 
-    property_options = {p["name"]: p["id"] for p in properties}
-    selected_name = st.selectbox("Select a property", list(property_options.keys()))
-    property_id = property_options[selected_name]
 
-    # Fetch from DB and convert sqlite3.Row -> dict so .get() works
-    prop_row = db.get_property_by_id(property_id)
-    if not prop_row:
-        st.error("Property not found in DB.")
-        return
+@st.cache_data(ttl=30, show_spinner=False)
+def _existing_files(paths: tuple) -> frozenset:
+    """Paths from ``paths`` that exist, using one scandir per directory.
 
-    prop = dict(prop_row)
+    Cached briefly so reruns don't stat the upload folders again; the status
+    editor clears it after saving new files.
+    """
+    existing: set = set()
+    for d in {os.path.dirname(p) for p in paths if p}:
+        try:
+            with os.scandir(d) as entries:
+                existing.update(entry.path for entry in entries if entry.is_file())
+        except OSError:
+            continue
+    return frozenset(existing)
+
+
+def _render_attachments_by_service(property_id: int, services: List[Dict[str, Any]]) -> None:
+    """One expander per service that has attachments, with image previews."""
+    att_by_svc = db.get_attachments_for_property(property_id)
+    existing = _existing_files(
+        tuple(att["file_path"] for atts in att_by_svc.values() for att in atts)
+    )
+    for s in services:
+        attachments = att_by_svc.get(s["id"])
+        if not attachments:
+            continue
+        with st.expander(
+            f"{s['category']} ({s['frequency']}) — Status: {s.get('status','Scheduled')}"
+        ):
+            for att in attachments:
+                st.write(
+                    f"**{att['file_name']}** "
+                    f"(uploaded {att['uploaded_at']}, by {att['uploaded_by']})"
+                )
+            # One gallery element per service instead of one per image
+            shown = [att for att in attachments if att["file_path"] in existing]
+            if shown:
+                st.image(
+                    [att["file_path"] for att in shown],
+                    width=250,
+                    caption=[att["file_name"] for att in shown],
+                )
 
-    col_info, col_summary = st.columns([2, 1])
-    with col_info:
-        st.subheader("Property Details")
-        st.write(f"**Name:** {prop['name']}")
-        st.write(f"**Address:** {prop['address']}")
-        st.write(f"**City/State/ZIP:** {prop['city']}, {prop['state']} {prop['zip']}")
 
-        with st.expander("✏️ Edit this property"):
-            with st.form(f"edit_property_form_{property_id}"):
-                col_ep1, col_ep2 = st.columns(2)
-                with col_ep1:
-                    edit_name = st.text_input("Property Name", value=prop["name"] or "")
-                    edit_address = st.text_input("Address", value=prop["address"] or "")
-                with col_ep2:
-                    edit_city = st.text_input("City", value=prop["city"] or "")
-                    edit_state = st.text_input("State", value=prop["state"] or "")
-                    edit_zip = st.text_input("ZIP", value=prop["zip"] or "")
-                col_fin1, col_fin2 = st.columns(2)
-                with col_fin1:
-                    edit_annual_quote = st.number_input(
-                        "Annual Quoted Revenue (USD)",
-                        min_value=0.0,
-                        max_value=10000000.0,
-                        value=float(prop.get("annual_quote", 0.0) or 0.0),
-                        step=100.0,
-                    )
-                with col_fin2:
-                    edit_annual_credited = st.number_input(
-                        "Annual Credited Revenue (USD)",
-                        min_value=0.0,
-                        max_value=10000000.0,
-                        value=float(prop.get("annual_credited", 0.0) or 0.0),
-                        step=100.0,
-                    )
-                save_prop = st.form_submit_button("Save Property Changes")
-                if save_prop:
-                    if not edit_name:
-                        st.error("Property name is required.")
-                    else:
-                        db.update_property(
-                            property_id,
-                            edit_name,
-                            edit_address,
-                            edit_city,
-                            edit_state,
-                            edit_zip,
-                            float(edit_annual_quote),
-                            float(edit_annual_credited),
-                        )
-                        st.success("Property updated.")
-                        st.rerun()
+def _as_categories(df: "pd.DataFrame", columns) -> "pd.DataFrame":
+    """Store low-cardinality text columns (status, role, ...) as categoricals."""
+    present = [c for c in columns if c in df.columns]
+    return df.astype({c: "category" for c in present}) if present else df
 
-    with col_summary:
-        summary = db.get_property_summary(property_id)
-        st.subheader("Summary")
-        st.metric("Total Services (No. of Times)", summary["total_services"])
-        st.metric(
-            "Total Annual Cost",
-            f"${summary['total_cost']:.2f}",
-        )
 
-        # Excel export button
-    with col_summary:
-        summary = db.get_property_summary(property_id)
-        st.subheader("Summary")
-        st.metric("Total Services (No. of Times)", summary["total_services"])
-        st.metric(
-            "Total Annual Cost",
-            f"${summary['total_cost']:.2f}",
-        )
+def _with_service_defaults(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Backfill the report columns property_services doesn't store (see _services_frame)."""
+    for column, default in (("Status", "Scheduled"), ("Start Date", None), ("End Date", None)):
+        if column not in df.columns:
+            df[column] = default
+    return df
 
-        # Excel export button
-        excel_buffer = generate_property_excel(property_id)
-        safe_name = prop['name'].replace(" ", "_").replace("/", "_")
-        st.download_button(
-            "⬇️ Download Excel for this property",
-            data=excel_buffer,
-            file_name=f"{safe_name}_landscaping.xlsx",
-            mime=(
-                "application/vnd.openxmlformats-officedocument."
-                "spreadsheetml.sheet"
-            ),
-        )
 
-    st.markdown("### Services for this Property")
-    services = db.get_services_for_property(property_id)
-    services = [dict(s) for s in services]
-    if services:
-        svc_df = pd.DataFrame(services)
-        svc_df["Total Cost"] = svc_df["times_per_year"] * svc_df["each_time_cost"]
-        svc_df = svc_df.rename(
-            columns={
-                "category": "Category",
-                "frequency": "Frequency",
-                "times_per_year": "No. of Times",
-                "each_time_cost": "Each Time Cost",
-                "status": "Status",
-                "start_date": "Start Date",
-                "end_date": "End Date",
-            }
-        )
-        st.dataframe(
-            svc_df.style.format(
-                {
-                    "Each Time Cost": "${:,.2f}".format,
-                    "Total Cost": "${:,.2f}".format,
-                }
+def _services_frame(services: List[Dict[str, Any]]) -> "pd.DataFrame":
+    """Display frame for a property's services, built column-wise in one shot."""
+    import pandas as pd
+
+    n = len(services)
+    # total_cost comes precomputed from the v_property_services view
+    return pd.DataFrame(
+        {
+            "Category": pd.Categorical([s["category"] for s in services]),
+            "Frequency": pd.Categorical([s["frequency"] for s in services]),
+            "No. of Times": np.fromiter(
+                (s["times_per_year"] or 0 for s in services), dtype=np.int32, count=n
             ),
-            use_container_width=True,
-        )
-    else:
-        st.info("No services configured for this property yet.")
+            "Each Time Cost": np.fromiter(
+                (s["each_time_cost"] or 0.0 for s in services), dtype=np.float64, count=n
+            ),
+            "Total Cost": np.fromiter(
+                (s["total_cost"] or 0.0 for s in services), dtype=np.float64, count=n
+            ),
+            "Status": pd.Categorical([s.get("status", "Scheduled") for s in services]),
+            "Start Date": [s.get("start_date") for s in services],
+            "End Date": [s.get("end_date") for s in services],
+            "Notes": [s.get("notes") for s in services],
+        }
+    )
+
 
+@st.fragment
+def _render_service_editor(
+    service_options: Dict[str, Dict[str, Any]], user: Dict[str, Any]
+) -> None:
+    """Edit-service picker and form; a fragment so switching services doesn't rerun the page."""
     # --- Edit Service Details ---
     st.markdown("### 🛠 Edit Service Details (Category, Frequency, Counts & Cost)")
-    if services:
-        edit_service_options = {
-            f"{s['category']} / {s['frequency']} (id={s['id']})": s for s in services
-        }
+    if service_options:
         edit_service_label = st.selectbox(
             "Select a service to edit",
-            list(edit_service_options.keys()),
+            list(service_options.keys()),
             key="edit_service_select",
         )
-        edit_service = edit_service_options[edit_service_label]
+        edit_service = service_options[edit_service_label]
 
         with st.form(f"edit_service_form_{edit_service['id']}"):
             col_es1, col_es2 = st.columns(2)
@@ -901,12 +971,11 @@ def admin_manage_properties(user: Dict[str, Any]):
                     step=1.0,
                 )
             # Date tracking for this service
-            import datetime as _dt
             existing_start = edit_service.get("start_date")
             try:
-                default_start = _dt.date.fromisoformat(existing_start) if existing_start else _dt.date.today()
+                default_start = date.fromisoformat(existing_start) if existing_start else date.today()
             except Exception:
-                default_start = _dt.date.today()
+                default_start = date.today()
             start_date_val = st.date_input(
                 "Service Start Date",
                 value=default_start,
@@ -923,7 +992,7 @@ def admin_manage_properties(user: Dict[str, Any]):
             end_date_val = None
             if has_end:
                 try:
-                    default_end = _dt.date.fromisoformat(existing_end) if existing_end else start_date_val
+                    default_end = date.fromisoformat(existing_end) if existing_end else start_date_val
                 except Exception:
                     default_end = start_date_val
                 end_date_val = st.date_input(
@@ -946,20 +1015,24 @@ def admin_manage_properties(user: Dict[str, Any]):
                     end_date=end_iso,
                     updated_by=user["username"],
                 )
+                _invalidate_property_data()
                 st.success("Service details updated.")
                 st.rerun()
     else:
         st.info("No services to edit yet. Add a service first.")
 
-# --- Status Update & Attachments ---
+
+@st.fragment
+def _render_service_status_editor(
+    property_id: int, service_options: Dict[str, Dict[str, Any]], user: Dict[str, Any]
+) -> None:
+    """Status/attachments picker and upload; a fragment for the same reason."""
+    # --- Status Update & Attachments ---
     st.markdown("### ✏️ Update Service Status & Attachments")
 
-    if not services:
+    if not service_options:
         st.info("Add at least one service to update status/attachments.")
     else:
-        service_options = {
-            f"{s['category']} / {s['frequency']} (id={s['id']})": s for s in services
-        }
         selected_service_label = st.selectbox(
             "Select a service to update status/attachments",
             list(service_options.keys()),
@@ -996,36 +1069,49 @@ def admin_manage_properties(user: Dict[str, Any]):
         )
 
         if st.button("Save status & attachments", type="primary"):
-            oversized = [
-                f.name for f in (uploaded_files or []) if len(f.getvalue()) > MAX_FILE_SIZE
-            ]
+            to_save, oversized, not_images = [], [], []
+            for f in uploaded_files or []:
+                if f.size > MAX_FILE_SIZE:
+                    oversized.append(f.name)
+                elif not _is_image_upload(f):
+                    not_images.append(f.name)
+                else:
+                    to_save.append(f)
             if oversized:
                 st.error(
                     "These files exceed 3 MB and were not saved: "
                     + ", ".join(oversized)
                 )
+            if not_images:
+                st.error(
+                    "These files are not PNG/JPEG images and were not saved: "
+                    + ", ".join(not_images)
+                )
 
             db.update_service_status(selected_service["id"], new_status, user["username"])
+            _invalidate_property_data()
 
-            for f in uploaded_files or []:
-                if len(f.getvalue()) > MAX_FILE_SIZE:
-                    continue
-                uploads_dir = os.path.join(
-                    "uploads",
-                    f"property_{property_id}",
-                    f"service_{selected_service['id']}",
-                )
+            attachment_rows = []
+            uploads_dir = os.path.join(
+                "uploads",
+                f"property_{property_id}",
+                f"service_{selected_service['id']}",
+            )
+            if to_save:
                 os.makedirs(uploads_dir, exist_ok=True)
+            for f in to_save:
                 safe_name = f.name.replace(" ", "_")
                 save_path = os.path.join(uploads_dir, safe_name)
+                # Stream in 64 KiB chunks rather than materialising the whole upload
+                f.seek(0)
                 with open(save_path, "wb") as out:
-                    out.write(f.getvalue())
-                db.add_service_attachment(
-                    service_id=selected_service["id"],
-                    file_name=f.name,
-                    file_path=save_path,
-                    uploaded_by=user["username"],
+                    shutil.copyfileobj(f, out, length=64 * 1024)
+                attachment_rows.append(
+                    (selected_service["id"], f.name, save_path, user["username"])
                 )
+            db.add_service_attachments_bulk(attachment_rows)
+            if attachment_rows:
+                _existing_files.clear()
 
             full_service = db.get_service_by_id(selected_service["id"])
             if full_service:
@@ -1040,35 +1126,194 @@ def admin_manage_properties(user: Dict[str, Any]):
             st.success("Service updated and attachments saved.")
             st.rerun()
 
+
+def admin_manage_properties(user: Dict[str, Any]):
+    st.title("🏠 Manage Properties & Services")
+
+    # --- Add New Property ---
+    with st.expander("➕ Add New Property"):
+        with st.form("add_property_form"):
+            col_np1, col_np2 = st.columns(2)
+            with col_np1:
+                new_name = st.text_input("Property Name")
+                new_address = st.text_input("Address")
+            with col_np2:
+                new_city = st.text_input("City")
+                new_state = st.text_input("State", value="TX")
+                new_zip = st.text_input("ZIP")
+            col_rf1, col_rf2 = st.columns(2)
+            with col_rf1:
+                new_annual_quote = st.number_input(
+                    "Annual Quoted Revenue (USD)",
+                    min_value=0.0,
+                    max_value=10000000.0,
+                    value=0.0,
+                    step=100.0,
+                )
+            with col_rf2:
+                new_annual_credited = st.number_input(
+                    "Annual Credited Revenue (USD)",
+                    min_value=0.0,
+                    max_value=10000000.0,
+                    value=0.0,
+                    step=100.0,
+                )
+            submit_prop = st.form_submit_button("Create Property", type="primary")
+            if submit_prop:
+                if not new_name:
+                    st.error("Property name is required.")
+                else:
+                    db.add_property(
+                        new_name,
+                        new_address,
+                        new_city,
+                        new_state,
+                        new_zip,
+                        float(new_annual_quote),
+                        float(new_annual_credited),
+                    )
+                    _invalidate_property_data()
+                    st.success("Property created.")
+                    st.rerun()
+
+    # --- Select / Edit Property ---
+    properties = cache_layer.cached_properties()
+    if not properties:
+        st.warning("No properties found. Create one using 'Add New Property'.")
+        return
+
+    property_options = {p["name"]: p["id"] for p in properties}
+    selected_name = st.selectbox("Select a property", list(property_options.keys()))
+    property_id = property_options[selected_name]
+
+    # cache_layer hands back plain dicts, so .get() works
+    prop = cache_layer.cached_property(property_id)
+    if not prop:
+        st.error("Property not found in DB.")
+        return
+
+    col_info, col_summary = st.columns([2, 1])
+    with col_info:
+        st.subheader("Property Details")
+        st.write(f"**Name:** {prop['name']}")
+        st.write(f"**Address:** {prop['address']}")
+        st.write(f"**City/State/ZIP:** {prop['city']}, {prop['state']} {prop['zip']}")
+
+        with st.expander("✏️ Edit this property"):
+            with st.form(f"edit_property_form_{property_id}"):
+                col_ep1, col_ep2 = st.columns(2)
+                with col_ep1:
+                    edit_name = st.text_input("Property Name", value=prop["name"] or "")
+                    edit_address = st.text_input("Address", value=prop["address"] or "")
+                with col_ep2:
+                    edit_city = st.text_input("City", value=prop["city"] or "")
+                    edit_state = st.text_input("State", value=prop["state"] or "")
+                    edit_zip = st.text_input("ZIP", value=prop["zip"] or "")
+                col_fin1, col_fin2 = st.columns(2)
+                with col_fin1:
+                    edit_annual_quote = st.number_input(
+                        "Annual Quoted Revenue (USD)",
+                        min_value=0.0,
+                        max_value=10000000.0,
+                        value=float(prop.get("annual_quote", 0.0) or 0.0),
+                        step=100.0,
+                    )
+                with col_fin2:
+                    edit_annual_credited = st.number_input(
+                        "Annual Credited Revenue (USD)",
+                        min_value=0.0,
+                        max_value=10000000.0,
+                        value=float(prop.get("annual_credited", 0.0) or 0.0),
+                        step=100.0,
+                    )
+                save_prop = st.form_submit_button("Save Property Changes")
+                if save_prop:
+                    if not edit_name:
+                        st.error("Property name is required.")
+                    else:
+                        db.update_property(
+                            property_id,
+                            edit_name,
+                            edit_address,
+                            edit_city,
+                            edit_state,
+                            edit_zip,
+                            float(edit_annual_quote),
+                            float(edit_annual_credited),
+                        )
+                        _invalidate_property_data()
+                        st.success("Property updated.")
+                        st.rerun()
+
+    with col_summary:
+        summary = cache_layer.cached_property_summary(property_id)
+        st.subheader("Summary")
+        st.metric("Total Services (No. of Times)", summary["total_services"])
+        st.metric(
+            "Total Annual Cost",
+            f"${summary['total_cost']:.2f}",
+        )
+
+        # Excel export button
+    with col_summary:
+        summary = cache_layer.cached_property_summary(property_id)
+        st.subheader("Summary")
+        st.metric("Total Services (No. of Times)", summary["total_services"])
+        st.metric(
+            "Total Annual Cost",
+            f"${summary['total_cost']:.2f}",
+        )
+
+        # Excel export button
+        excel_buffer = _property_excel_bytes(property_id)
+        safe_name = prop['name'].replace(" ", "_").replace("/", "_")
+        st.download_button(
+            "⬇️ Download Excel for this property",
+            data=excel_buffer,
+            file_name=f"{safe_name}_landscaping.xlsx",
+            mime=(
+                "application/vnd.openxmlformats-officedocument."
+                "spreadsheetml.sheet"
+            ),
+        )
+
+    st.markdown("### Services for this Property")
+    services = cache_layer.cached_services(property_id)
+    if services:
+        svc_df = _services_frame(services)
+        st.dataframe(
+            svc_df,
+            use_container_width=True,
+            column_config={
+                "Each Time Cost": st.column_config.NumberColumn(format="$%.2f"),
+                "Total Cost": st.column_config.NumberColumn(format="$%.2f"),
+            },
+        )
+    else:
+        st.info("No services configured for this property yet.")
+
+    # One pass for the picker labels shared by both editors
+    service_options = {
+        f"{s['category']} / {s['frequency']} (id={s['id']})": s for s in services
+    }
+    _render_service_editor(service_options, user)
+    _render_service_status_editor(property_id, service_options, user)
+
     # Attachments overview
     st.markdown("### 📎 Attachments by Service")
     if services:
-        for s in services:
-            attachments = db.get_service_attachments(s["id"])
-            if not attachments:
-                continue
-            with st.expander(
-                f"{s['category']} ({s['frequency']}) — Status: {s.get('status','Scheduled')}"
-            ):
-                for att in attachments:
-                    st.write(
-                        f"**{att['file_name']}** "
-                        f"(uploaded {att['uploaded_at']}, by {att['uploaded_by']})"
-                    )
-                    if att["file_path"] and os.path.exists(att["file_path"]):
-                        st.image(att["file_path"], width=250)
+        _render_attachments_by_service(property_id, services)
 
     st.markdown("### ➕ Add Service to this Property")
 
-    price_rows = db.get_price_master_all()
-    if not price_rows:
+    category_index = cache_layer.cached_price_category_index()
+    if not category_index:
         st.error("Price master is empty. Please configure it first.")
         return
 
-    categories = sorted({r["category"] for r in price_rows})
-    category = st.selectbox("Category", categories)
+    category = st.selectbox("Category", list(category_index))
 
-    valid_freqs = sorted({r["frequency"] for r in price_rows if r["category"] == category})
+    valid_freqs = category_index[category]
     frequency = st.selectbox("Frequency", valid_freqs)
 
     times_per_year = st.number_input(
@@ -1087,6 +1332,7 @@ def admin_manage_properties(user: Dict[str, Any]):
 
     if st.button("Add Service", type="secondary"):
         db.add_service_to_property(property_id, category, frequency, int(times_per_year))
+        _invalidate_property_data()
         st.success("Service added successfully.")
         st.rerun()
 
@@ -1095,20 +1341,23 @@ def admin_manage_properties(user: Dict[str, Any]):
 def admin_price_master():
     st.title("💰 Price Master (Frisco-based suggested rates)")
 
-    rows = db.get_price_master_all()
+    rows = cache_layer.cached_price_master()
     if rows:
-        df = pd.DataFrame(rows)
-        df = df.rename(
-            columns={
-                "category": "Category",
-                "frequency": "Frequency",
-                "default_cost": "Default Each Time Cost",
-                "notes": "Notes",
-            }
+        import pandas as pd
+
+        df = pd.DataFrame.from_records(
+            (
+                (r["id"], r["category"], r["frequency"], r["default_cost"], r["notes"])
+                for r in rows
+            ),
+            columns=["id", "Category", "Frequency", "Default Each Time Cost", "Notes"],
         )
         st.dataframe(
-            df.style.format({"Default Each Time Cost": "${:,.2f}".format}),
+            df,
             use_container_width=True,
+            column_config={
+                "Default Each Time Cost": st.column_config.NumberColumn(format="$%.2f"),
+            },
         )
     else:
         st.info("No rows in price master yet. Use the form below to add some.")
@@ -1135,6 +1384,7 @@ def admin_price_master():
                 st.error("Category and Frequency are required.")
             else:
                 db.add_price_master_entry(category, frequency, float(default_cost), notes)
+                cache_layer.clear_price_master_caches()
                 st.success("Price master entry added.")
                 st.rerun()
 
@@ -1142,7 +1392,7 @@ def admin_price_master():
 def admin_tickets():
     st.title("🎫 Tickets (Owner Requests / Issues)")
 
-    tickets = db.list_all_tickets()
+    tickets = cache_layer.cached_all_tickets()
     if not tickets:
         st.info("No tickets yet.")
         return
@@ -1183,10 +1433,49 @@ def admin_tickets():
             )
             if st.button("Save Changes", key=f"save_{t['id']}"):
                 db.update_ticket(t["id"], new_status, new_comment)
+                cache_layer.clear_ticket_caches()
+                generate_consolidated_excel_cached.clear()
                 st.success("Ticket updated.")
                 st.rerun()
 
 
+@st.fragment
+def _render_person_editor(p: Dict[str, Any]) -> None:
+    """Edit form for one service person, isolated as a fragment."""
+    header = p["full_name"]
+    if p.get("role"):
+        header += f" — {p['role']}"
+    with st.expander(header):
+        with st.form(f"edit_service_person_form_{p['id']}"):
+            col_ep1, col_ep2 = st.columns(2)
+            with col_ep1:
+                full_name_edit = st.text_input("Full Name", value=p["full_name"] or "")
+                role_edit = st.text_input("Role / Specialization", value=p["role"] or "")
+            with col_ep2:
+                email_edit = st.text_input("Email", value=p["email"] or "")
+                phone_edit = st.text_input("Mobile Number (E.164)", value=p["phone"] or "")
+            notes_edit = st.text_area("Notes", value=p["notes"] or "")
+            is_active_edit = st.checkbox("Active", value=bool(p["is_active"]), key=f"active_{p['id']}")
+            save_edit = st.form_submit_button("Save Changes")
+            if save_edit:
+                if not full_name_edit:
+                    st.error("Full Name is required.")
+                else:
+                    db.update_service_person(
+                        person_id=p["id"],
+                        full_name=full_name_edit,
+                        email=email_edit,
+                        phone=phone_edit,
+                        role=role_edit,
+                        notes=notes_edit,
+                        is_active=is_active_edit,
+                    )
+                    cache_layer.cached_service_persons.clear()
+                    _active_provider_options.clear()
+                    st.success("Service person updated.")
+                    st.rerun()
+
+
 def admin_service_personnel(user: Dict[str, Any]):
     st.title("🧑‍🔧 Service Personnel Management")
     st.markdown(
@@ -1212,6 +1501,8 @@ def admin_service_personnel(user: Dict[str, Any]):
                     st.error("Full Name is required.")
                 else:
                     db.add_service_person(full_name, email, phone, role, notes, is_active)
+                    cache_layer.cached_service_persons.clear()
+                    _active_provider_options.clear()
                     st.success("Service person saved.")
                     st.rerun()
 
@@ -1222,54 +1513,20 @@ def admin_service_personnel(user: Dict[str, Any]):
         return
 
     st.markdown("### Current Service Persons")
-    df = pd.DataFrame(persons)
-    if not df.empty:
-        df_display = df.rename(
-            columns={
-                "full_name": "Full Name",
-                "email": "Email",
-                "phone": "Phone",
-                "role": "Role",
-                "notes": "Notes",
-                "is_active": "Active",
-            }
-        )[["Full Name", "Email", "Phone", "Role", "Active"]]
-        st.dataframe(df_display, use_container_width=True)
-    else:
-        st.info("No data to display.")
+    import pandas as pd
+
+    df_display = pd.DataFrame.from_records(
+        (
+            (p["full_name"], p["email"], p["phone"], p["role"], p["is_active"])
+            for p in persons
+        ),
+        columns=["Full Name", "Email", "Phone", "Role", "Active"],
+    )
+    st.dataframe(df_display, use_container_width=True)
 
     st.markdown("### ✏️ Edit Service Person Details")
     for p in persons:
-        header = p["full_name"]
-        if p.get("role"):
-            header += f" — {p['role']}"
-        with st.expander(header):
-            with st.form(f"edit_service_person_form_{p['id']}"):
-                col_ep1, col_ep2 = st.columns(2)
-                with col_ep1:
-                    full_name_edit = st.text_input("Full Name", value=p["full_name"] or "")
-                    role_edit = st.text_input("Role / Specialization", value=p["role"] or "")
-                with col_ep2:
-                    email_edit = st.text_input("Email", value=p["email"] or "")
-                    phone_edit = st.text_input("Mobile Number (E.164)", value=p["phone"] or "")
-                notes_edit = st.text_area("Notes", value=p["notes"] or "")
-                is_active_edit = st.checkbox("Active", value=bool(p["is_active"]), key=f"active_{p['id']}")
-                save_edit = st.form_submit_button("Save Changes")
-                if save_edit:
-                    if not full_name_edit:
-                        st.error("Full Name is required.")
-                    else:
-                        db.update_service_person(
-                            person_id=p["id"],
-                            full_name=full_name_edit,
-                            email=email_edit,
-                            phone=phone_edit,
-                            role=role_edit,
-                            notes=notes_edit,
-                            is_active=is_active_edit,
-                        )
-                        st.success("Service person updated.")
-                        st.rerun()
+        _render_person_editor(p)
 
     # --- Send Reminder to Service Persons ---
     st.markdown("### 📣 Send Reminder to Service Persons")
@@ -1308,18 +1565,22 @@ def admin_service_personnel(user: Dict[str, Any]):
         if not selected_labels:
             st.error("Please select at least one recipient.")
         else:
-            email_count = 0
-            sms_count = 0
-            for label in selected_labels:
-                p = label_map[label]
-                if send_email and p.get("email"):
-                    resp = send_email_notification(p["email"], subject, body)
-                    if resp.startswith("Email sent"):
-                        email_count += 1
-                if send_sms and p.get("phone"):
-                    resp = send_sms_notification(p["phone"], body)
-                    if resp.startswith("SMS sent"):
-                        sms_count += 1
+            # Fan the sends out over the notify pool so the total wait is
+            # roughly the slowest delivery, not the sum of all of them.
+            pool = _notify_pool()
+            recipients = [label_map[label] for label in selected_labels]
+            email_futs = [
+                pool.submit(send_email_notification, p["email"], subject, body)
+                for p in recipients
+                if send_email and p.get("email")
+            ]
+            sms_futs = [
+                pool.submit(send_sms_notification, p["phone"], body)
+                for p in recipients
+                if send_sms and p.get("phone")
+            ]
+            email_count = sum(1 for f in email_futs if f.result().startswith("Email sent"))
+            sms_count = sum(1 for f in sms_futs if f.result().startswith("SMS sent"))
             st.success(
                 f"Reminder sent. Emails attempted to {email_count} contact(s), "
                 f"SMS attempted to {sms_count} contact(s) (where contact info was available)."
@@ -1330,13 +1591,147 @@ def admin_service_personnel(user: Dict[str, Any]):
 
 
 
+# Rows shown per page in the scheduler's activity table
+EVENTS_PAGE_SIZE = 25
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _active_provider_options(sp_signature: Tuple[Tuple[int, str, int], ...]) -> Dict[str, Optional[int]]:
+    """Label -> id map for the provider picker; keyed by the personnel signature."""
+    options: Dict[str, Optional[int]] = {"(Unassigned)": None}
+    for sp_id, full_name, is_active in sp_signature:
+        if is_active:
+            options[f"{full_name} (ID {sp_id})"] = sp_id
+    return options
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _service_options(property_id: int) -> Dict[str, Dict[str, Any]]:
+    """Label -> service map for the scheduler's service picker."""
+    return {
+        f"{s['category']} — {s['frequency']} (service #{s['id']})": s
+        for s in cache_layer.cached_services(property_id)
+    }
+
+
+@st.fragment
+def _render_event_row(e: Dict[str, Any], due_state: str, user: Dict[str, Any]) -> None:
+    """Expander for one scheduled event.
+
+    Runs as a fragment so widget interactions only rerun this expander;
+    saving or sending a reminder reruns the app to refresh the event.
+    """
+    with st.expander(
+        f"[# {e['id']}] {e['scheduled_date']} — {e['property_name']} — {e['service_category']}"
+    ):
+        st.write(f"**Property:** {e['property_name']}")
+        st.write(f"**Service / Activity:** {e['service_category']}")
+        st.write(f"**Scheduled Date:** {e['scheduled_date']}")
+        st.write(f"**Current Status:** {e['status']} ({due_state})")
+
+        # Status & follow-up form
+        with st.form(f"evt_status_form_{e['id']}"):
+            col_s1, col_s2 = st.columns(2)
+            with col_s1:
+                new_status = st.selectbox(
+                    "Status",
+                    ["Scheduled", "Completed", "Cancelled"],
+                    index=["Scheduled", "Completed", "Cancelled"].index(e["status"]),
+                )
+            with col_s2:
+                new_followup_required = st.checkbox(
+                    "Follow-up required",
+                    value=bool(e["followup_required"]),
+                    key=f"evt_fu_{e['id']}",
+                )
+            new_followup_notes = st.text_area(
+                "Follow-up notes",
+                value=e.get("followup_notes") or "",
+                key=f"evt_notes_{e['id']}",
+            )
+            save_evt = st.form_submit_button("Save Status / Follow-up")
+
+        if save_evt:
+            db.update_service_event_status(
+                event_id=e["id"],
+                status=new_status,
+                followup_required=new_followup_required,
+                followup_notes=new_followup_notes,
+            )
+            cache_layer.cached_events.clear()
+            st.success("Event updated.")
+            st.rerun()
+
+        # Reminder section
+        st.markdown("#### 📬 Send Reminder to Assigned Provider")
+        if e.get("provider_id") and (e.get("provider_email") or e.get("provider_phone")):
+            st.write(
+                f"Assigned to: **{e.get('provider_name')}** "
+                f"(Email: {e.get('provider_email') or 'N/A'}, Phone: {e.get('provider_phone') or 'N/A'})"
+            )
+            if e.get("last_reminder_at"):
+                st.caption(f"Last reminder sent at: {e['last_reminder_at']}")
+
+            if st.button(
+                f"Send Reminder to Provider (Event #{e['id']})",
+                key=f"evt_rem_{e['id']}",
+            ):
+                # Build simple reminder message
+                subject = f"Reminder: {e['service_category']} at {e['property_name']} on {e['scheduled_date']}"
+                body = (
+                    f"Hello {e.get('provider_name') or ''},\n\n"
+                    f"This is a friendly reminder to complete the following scheduled activity:\n\n"
+                    f"- Property: {e['property_name']}\n"
+                    f"- Activity: {e['service_category']}\n"
+                    f"- Scheduled date: {e['scheduled_date']}\n\n"
+                    f"Please update the status once completed.\n\n"
+                    f"Regards,\nLandscaping Admin"
+                )
+
+                # Email and SMS go out in parallel on the notify pool
+                pool = _notify_pool()
+                email_fut = (
+                    pool.submit(send_email_notification, e["provider_email"], subject, body)
+                    if e.get("provider_email")
+                    else None
+                )
+                sms_fut = (
+                    pool.submit(send_sms_notification, e["provider_phone"], body)
+                    if e.get("provider_phone")
+                    else None
+                )
+                # The senders report failures in their return value, not by raising
+                email_sent = email_fut is not None and email_fut.result().startswith("Email sent")
+                sms_sent = sms_fut is not None and sms_fut.result().startswith("SMS sent")
+
+                db.touch_service_event_reminder(e["id"])
+                cache_layer.cached_events.clear()
+
+                # ``e`` was read before the send; rerun the whole app so the
+                # row re-renders with the new last_reminder_at. A toast
+                # survives the rerun where st.success would not.
+                st.toast(
+                    f"Reminder sent (email: {'yes' if email_sent else 'no'}, "
+                    f"SMS: {'yes' if sms_sent else 'no'})."
+                )
+                st.rerun(scope="app")
+        else:
+            st.info(
+                "No assigned service person with contact info for this activity. "
+                "Assign a service person with email/phone in Service Personnel module first."
+            )
+
+
 def admin_event_scheduler(user: Dict[str, Any]) -> None:
     """Admin module to schedule activities and send reminders to service providers."""
     st.title("📆 Event Scheduler & Activity Reminders")
 
     # Load basic lookup data
-    properties = db.get_all_properties()
-    service_persons = db.get_all_service_persons()
+    properties = cache_layer.cached_properties()
+    service_persons = cache_layer.cached_service_persons()
+    sp_signature = tuple(
+        (sp["id"], sp["full_name"], sp.get("is_active", 1)) for sp in service_persons
+    )
 
     if not properties:
         st.info("No properties available yet. Please add a property first.")
@@ -1351,15 +1746,9 @@ def admin_event_scheduler(user: Dict[str, Any]) -> None:
             prop_label = st.selectbox("Property", list(prop_option_map.keys()))
             sel_property_id = prop_option_map[prop_label]
 
-            # Load services for this property to allow linking
-            services = db.get_services_for_property(sel_property_id)
-            services = [dict(s) for s in services]
-
         with col_p2:
-            service_options = {}
-            for s in services:
-                label = f"{s['category']} — {s['frequency']} (service #{s['id']})"
-                service_options[label] = s
+            # Services for this property, to allow linking
+            service_options = _service_options(sel_property_id)
             service_labels = list(service_options.keys())
             service_labels.append("Ad-hoc / Custom activity")
             sel_service_label = st.selectbox(
@@ -1378,12 +1767,7 @@ def admin_event_scheduler(user: Dict[str, Any]) -> None:
             sel_category = str(chosen["category"])
 
         # Assign provider (optional)
-        provider_option_map = {"(Unassigned)": None}
-        for sp in service_persons:
-            if not sp.get("is_active", 1):
-                continue
-            label = f"{sp['full_name']} (ID {sp['id']})"
-            provider_option_map[label] = sp["id"]
+        provider_option_map = _active_provider_options(sp_signature)
         provider_label = st.selectbox("Assign Service Person (optional)", list(provider_option_map.keys()))
         sel_provider_id = provider_option_map[provider_label]
 
@@ -1412,6 +1796,7 @@ def admin_event_scheduler(user: Dict[str, Any]) -> None:
                 followup_required=followup_required,
                 followup_notes=followup_notes,
             )
+            cache_layer.cached_events.clear()
             st.success("Scheduled activity created.")
             st.rerun()
 
@@ -1430,26 +1815,28 @@ def admin_event_scheduler(user: Dict[str, Any]) -> None:
         st.error("From date cannot be after To date.")
         return
 
-    events = db.get_scheduled_events(from_date.isoformat(), to_date.isoformat())
+    events = cache_layer.cached_events(from_date.isoformat(), to_date.isoformat())
 
     if not events:
         st.info("No scheduled activities in this date range.")
         return
 
-    # Compute due state
-    today_str = today.isoformat()
-    for e in events:
-        if e["status"] != "Scheduled":
-            e["due_state"] = e["status"]
-        else:
-            if e["scheduled_date"] < today_str:
-                e["due_state"] = "Overdue"
-            elif e["scheduled_date"] == today_str:
-                e["due_state"] = "Due today"
-            else:
-                e["due_state"] = "Upcoming"
+    # Only the visible page is turned into table rows and expanders
+    total_events = len(events)
+    page_count = (total_events + EVENTS_PAGE_SIZE - 1) // EVENTS_PAGE_SIZE
+    page = 1
+    if page_count > 1:
+        page = st.number_input(
+            f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1,
+            key="evt_page",
+        )
+    start = (int(page) - 1) * EVENTS_PAGE_SIZE
+    events = events[start:start + EVENTS_PAGE_SIZE]
+    st.caption(f"Showing activities {start + 1}–{start + len(events)} of {total_events}.")
 
     # Summary table
+    import pandas as pd
+
     df_evt = pd.DataFrame(
         [
             {
@@ -1459,7 +1846,6 @@ def admin_event_scheduler(user: Dict[str, Any]) -> None:
                 "Service / Activity": e["service_category"],
                 "Provider": e.get("provider_name") or "(Unassigned)",
                 "Status": e["status"],
-                "Due / Follow-up State": e["due_state"],
                 "Follow-up Required": bool(e["followup_required"]),
                 "Last Reminder At": e.get("last_reminder_at"),
             }
@@ -1467,406 +1853,338 @@ def admin_event_scheduler(user: Dict[str, Any]) -> None:
         ]
     )
 
+    # Compute due state for the whole page at once (ISO dates compare as strings)
+    today_str = today.isoformat()
+    sched = df_evt["Date"].to_numpy()
+    status = df_evt["Status"].to_numpy()
+    due_state = np.select(
+        [status != "Scheduled", sched < today_str, sched == today_str],
+        [status, "Overdue", "Due today"],
+        default="Upcoming",
+    )
+    df_evt.insert(df_evt.columns.get_loc("Status") + 1, "Due / Follow-up State", due_state)
+
     st.dataframe(df_evt, use_container_width=True)
 
     st.markdown("---")
     st.markdown("### 🔁 Manage Individual Activities, Reminders & Follow-ups")
 
-    for e in events:
-        with st.expander(
-            f"[# {e['id']}] {e['scheduled_date']} — {e['property_name']} — {e['service_category']}"
-        ):
-            st.write(f"**Property:** {e['property_name']}")
-            st.write(f"**Service / Activity:** {e['service_category']}")
-            st.write(f"**Scheduled Date:** {e['scheduled_date']}")
-            st.write(f"**Current Status:** {e['status']} ({e['due_state']})")
-
-            # Status & follow-up form
-            with st.form(f"evt_status_form_{e['id']}"):
-                col_s1, col_s2 = st.columns(2)
-                with col_s1:
-                    new_status = st.selectbox(
-                        "Status",
-                        ["Scheduled", "Completed", "Cancelled"],
-                        index=["Scheduled", "Completed", "Cancelled"].index(e["status"]),
-                    )
-                with col_s2:
-                    new_followup_required = st.checkbox(
-                        "Follow-up required",
-                        value=bool(e["followup_required"]),
-                        key=f"evt_fu_{e['id']}",
-                    )
-                new_followup_notes = st.text_area(
-                    "Follow-up notes",
-                    value=e.get("followup_notes") or "",
-                    key=f"evt_notes_{e['id']}",
-                )
-                save_evt = st.form_submit_button("Save Status / Follow-up")
-
-            if save_evt:
-                db.update_service_event_status(
-                    event_id=e["id"],
-                    status=new_status,
-                    followup_required=new_followup_required,
-                    followup_notes=new_followup_notes,
-                )
-                st.success("Event updated.")
-                st.rerun()
+    for e, state in zip(events, due_state.tolist()):
+        _render_event_row(e, state, user)
 
-            # Reminder section
-            st.markdown("#### 📬 Send Reminder to Assigned Provider")
-            if e.get("provider_id") and (e.get("provider_email") or e.get("provider_phone")):
-                st.write(
-                    f"Assigned to: **{e.get('provider_name')}** "
-                    f"(Email: {e.get('provider_email') or 'N/A'}, Phone: {e.get('provider_phone') or 'N/A'})"
-                )
-                if e.get("last_reminder_at"):
-                    st.caption(f"Last reminder sent at: {e['last_reminder_at']}")
-
-                if st.button(
-                    f"Send Reminder to Provider (Event #{e['id']})",
-                    key=f"evt_rem_{e['id']}",
-                ):
-                    # Build simple reminder message
-                    subject = f"Reminder: {e['service_category']} at {e['property_name']} on {e['scheduled_date']}"
-                    body = (
-                        f"Hello {e.get('provider_name') or ''},\n\n"
-                        f"This is a friendly reminder to complete the following scheduled activity:\n\n"
-                        f"- Property: {e['property_name']}\n"
-                        f"- Activity: {e['service_category']}\n"
-                        f"- Scheduled date: {e['scheduled_date']}\n\n"
-                        f"Please update the status once completed.\n\n"
-                        f"Regards,\nLandscaping Admin"
-                    )
 
-                    email_sent = False
-                    sms_sent = False
-                    if e.get("provider_email"):
-                        try:
-                            send_email_notification(e["provider_email"], subject, body)
-                            email_sent = True
-                        except Exception:
-                            pass
-                    if e.get("provider_phone"):
-                        try:
-                            send_sms_notification(e["provider_phone"], body)
-                            sms_sent = True
-                        except Exception:
-                            pass
+# Session-state prefix for the "report prepared" flags
+_REPORT_EXCEL_PREFIX = "_report_excel_"
 
-                    db.touch_service_event_reminder(e["id"])
 
-                    st.success(
-                        f"Reminder sent (email: {'yes' if email_sent else 'no'}, "
-                        f"SMS: {'yes' if sms_sent else 'no'})."
-                    )
-            else:
-                st.info(
-                    "No assigned service person with contact info for this activity. "
-                    "Assign a service person with email/phone in Service Personnel module first."
-                )
-def admin_reports(user: Dict[str, Any]):
-    st.title("📑 Reports")
+def _lazy_excel_download(key: str, build, label: str, file_name: str) -> None:
+    """Build a report workbook only when asked, then offer it for download.
 
-    mode = st.radio(
-        "Report Type",
-        ["Consolidated (All Properties)", "Per Property", "Per Owner"],
-        horizontal=True,
+    Only the fact that the user asked is kept in session state. The bytes
+    come from ``build``, whose cached builders are keyed by a data version,
+    so a write from any session is reflected on the next render.
+    """
+    state_key = _REPORT_EXCEL_PREFIX + key
+    if st.button("Prepare Excel report", key=f"prepare_{state_key}"):
+        st.session_state[state_key] = True
+    if not st.session_state.get(state_key):
+        st.caption("Click Prepare to build the workbook.")
+        return
+    data = build()
+    st.download_button(
+        label,
+        data=data,
+        file_name=file_name,
+        mime=(
+            "application/vnd.openxmlformats-officedocument."
+            "spreadsheetml.sheet"
+        ),
     )
 
-    if mode == "Consolidated (All Properties)":
-        st.subheader("Consolidated Portfolio Overview")
-
-        props_summary = db.get_properties_summary()
-        owners = db.list_users(role="owner")
-        services = db.get_all_services_with_property()
-        tickets = db.list_all_tickets()
-
-        total_props = len(props_summary)
-        total_services = sum(p["total_services"] for p in props_summary) if props_summary else 0
-        total_cost = sum(p["total_cost"] for p in props_summary) if props_summary else 0.0
-        total_quoted = sum(p.get("annual_quote", 0.0) for p in props_summary) if props_summary else 0.0
-        total_credited = sum(p.get("annual_credited", 0.0) for p in props_summary) if props_summary else 0.0
-        total_margin = total_credited - total_cost
-        total_owners = len(owners) if owners else 0
-        total_tickets = len(tickets) if tickets else 0
-
-        c1, c2, c3, c4 = st.columns(4)
-        with c1:
-            st.metric("Total Properties", total_props)
-        with c2:
-            st.metric("Total Owners", total_owners)
-        with c3:
-            st.metric("Total Services (No. of Times)", int(total_services))
-        with c4:
-            st.metric("Total Annual Cost", f"${total_cost:,.2f}")
-
-        c5, c6, c7 = st.columns(3)
-        with c5:
-            st.metric("Total Quoted Revenue", f"${total_quoted:,.2f}")
-        with c6:
-            st.metric("Total Credited Revenue", f"${total_credited:,.2f}")
-        with c7:
-            st.metric("Total Portfolio Margin", f"${total_margin:,.2f}")
-
-        if props_summary:
-            df_props = pd.DataFrame(
-                [
-                    {
-                        "Property ID": r["id"],
-                        "Property Name": r["name"],
-                        "Total Services (No. of Times)": r["total_services"],
-                        "Total Annual Cost": r["total_cost"],
-                        "Annual Quoted Revenue": r.get("annual_quote", 0.0),
-                        "Annual Credited Revenue": r.get("annual_credited", 0.0),
-                    }
-                    for r in props_summary
-                ]
-            )
-            df_props["Credited Margin"] = df_props["Annual Credited Revenue"] - df_props["Total Annual Cost"]
-            df_props["Credited ROI %"] = df_props.apply(
-                lambda row: ((row["Credited Margin"] / row["Total Annual Cost"]) * 100.0)
-                if row["Total Annual Cost"] > 0
-                else None,
-                axis=1,
-            )
-            st.markdown("#### Property Summary")
-            st.dataframe(
-                df_props.style.format(
-                    {
-                        "Total Annual Cost": "${:,.2f}".format,
-                        "Annual Quoted Revenue": "${:,.2f}".format,
-                        "Annual Credited Revenue": "${:,.2f}".format,
-                        "Credited Margin": "${:,.2f}".format,
-                        "Credited ROI %": "{:,.2f}%".format,
-                    }
-                ),
-                use_container_width=True,
-            )
 
-            st.markdown("#### Annual Cost per Property")
-            chart_df = df_props.set_index("Property Name")[["Total Annual Cost"]]
-            st.bar_chart(chart_df)
-
-        if services:
-            st.markdown("#### Services Snapshot (All Properties)")
-            df_services = pd.DataFrame(services)
-            df_services["Total Cost"] = df_services["times_per_year"] * df_services["each_time_cost"]
-            df_services = df_services.rename(
-                columns={
-                    "property_name": "Property Name",
-                    "category": "Category",
-                    "frequency": "Frequency",
-                    "times_per_year": "No. of Times",
-                    "each_time_cost": "Each Time Cost",
-                    "status": "Status",
-                    "start_date": "Start Date",
-                    "end_date": "End Date",
-                    "Total Cost": "Total Cost",
-                }
-            )
-            st.dataframe(
-                df_services[
-                    ["Property Name", "Category", "Frequency", "No. of Times", "Each Time Cost", "Status"]
-                ].style.format(
-                    {
-                        "Each Time Cost": "${:,.2f}".format,
-                    }
-                ),
-                use_container_width=True,
-            )
+@st.fragment
+def _report_consolidated() -> None:
+    """Consolidated portfolio report; a fragment so its widgets rerun only this report."""
+    import pandas as pd
+
+    st.subheader("Consolidated Portfolio Overview")
+
+    props_summary = cache_layer.cached_properties_summary()
+    owners = cache_layer.cached_users("owner")
+    services = cache_layer.cached_all_services_with_property()
+    tickets = cache_layer.cached_all_tickets()
+
+    totals = cache_layer.cached_portfolio_totals()
+    total_owners = len(owners) if owners else 0
+    total_tickets = len(tickets) if tickets else 0
+
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        st.metric("Total Properties", totals["total_properties"])
+    with c2:
+        st.metric("Total Owners", total_owners)
+    with c3:
+        st.metric("Total Services (No. of Times)", int(totals["total_services"]))
+    with c4:
+        st.metric("Total Annual Cost", f"${totals['total_cost']:,.2f}")
+
+    c5, c6, c7 = st.columns(3)
+    with c5:
+        st.metric("Total Quoted Revenue", f"${totals['total_quoted']:,.2f}")
+    with c6:
+        st.metric("Total Credited Revenue", f"${totals['total_credited']:,.2f}")
+    with c7:
+        st.metric("Total Portfolio Margin", f"${totals['total_margin']:,.2f}")
+
+    if props_summary:
+        df_props = _properties_summary_frame(props_summary)
+        st.markdown("#### Property Summary")
+        st.dataframe(
+            df_props,
+            use_container_width=True,
+            column_config={
+                "Total Annual Cost": st.column_config.NumberColumn(format="$%.2f"),
+                "Annual Quoted Revenue": st.column_config.NumberColumn(format="$%.2f"),
+                "Annual Credited Revenue": st.column_config.NumberColumn(format="$%.2f"),
+                "Credited Margin": st.column_config.NumberColumn(format="$%.2f"),
+                "Credited ROI %": st.column_config.NumberColumn(format="%.2f%%"),
+            },
+        )
 
-        # Consolidated Excel download
-        st.markdown("#### Download Consolidated Excel Report")
-        excel_buffer = generate_consolidated_excel()
-        st.download_button(
-            "⬇️ Download Consolidated Report",
-            data=excel_buffer,
-            file_name="landscaping_consolidated_report.xlsx",
-            mime=(
-                "application/vnd.openxmlformats-officedocument."
-                "spreadsheetml.sheet"
-            ),
+        with st.expander(f"Annual Cost per Property (top {_CHART_TOP_N})"):
+            st.bar_chart(_top_cost_chart_frame(df_props))
+
+    if services:
+        st.markdown("#### Services Snapshot (All Properties)")
+        df_services = pd.DataFrame(services)
+        df_services = df_services.rename(
+            columns={
+                "property_name": "Property Name",
+                "category": "Category",
+                "frequency": "Frequency",
+                "times_per_year": "No. of Times",
+                "each_time_cost": "Each Time Cost",
+                "status": "Status",
+                "start_date": "Start Date",
+                "end_date": "End Date",
+                "total_cost": "Total Cost",
+            }
+        )
+        df_services = _as_categories(
+            _with_service_defaults(df_services), ("Category", "Frequency", "Status")
+        )
+        st.dataframe(
+            df_services[
+                ["Property Name", "Category", "Frequency", "No. of Times", "Each Time Cost", "Status"]
+            ],
+            use_container_width=True,
+            column_config={
+                "Each Time Cost": st.column_config.NumberColumn(format="$%.2f"),
+            },
         )
 
-    elif mode == "Per Property":
-        st.subheader("Per-Property Report")
-
-        properties = db.get_all_properties()
-        if not properties:
-            st.warning("No properties found.")
-            return
-
-        property_options = {p["name"]: p["id"] for p in properties}
-        selected_name = st.selectbox("Select a property", list(property_options.keys()))
-        property_id = property_options[selected_name]
-
-        prop = db.get_property_by_id(property_id)
-        summary = db.get_property_summary(property_id)
-        services = db.get_services_for_property(property_id)
-        tickets = [t for t in db.list_all_tickets() if t["property_name"] == prop["name"]] if prop else []
-
-        c1, c2, c3 = st.columns(3)
-        with c1:
-            st.metric("Total Services (No. of Times)", summary["total_services"])
-        with c2:
-            st.metric("Total Annual Cost", f"${summary['total_cost']:,.2f}")
-        with c3:
-            st.metric("Tickets (All Statuses)", len(tickets))
-
-        if services:
-            df = pd.DataFrame(services)
-            df["Total Cost"] = df["times_per_year"] * df["each_time_cost"]
-            df = df.rename(
-                columns={
-                    "category": "Category",
-                    "frequency": "Frequency",
-                    "times_per_year": "No. of Times",
-                    "each_time_cost": "Each Time Cost",
-                    "status": "Status",
-                    "start_date": "Start Date",
-                    "end_date": "End Date",
-                }
-            )
-            st.markdown("#### Services for this Property")
-            st.dataframe(
-                df[["Category", "Frequency", "No. of Times", "Each Time Cost", "Status", "Start Date", "End Date", "Total Cost"]].style.format(
-                    {
-                        "Each Time Cost": "${:,.2f}".format,
-                        "Total Cost": "${:,.2f}".format,
-                    }
-                ),
-                use_container_width=True,
-            )
-        else:
-            st.info("No services found for this property.")
-
-        if tickets:
-            df_t = pd.DataFrame(tickets)
-            df_t = df_t.rename(
-                columns={
-                    "id": "Ticket ID",
-                    "title": "Title",
-                    "status": "Status",
-                    "created_at": "Created At",
-                    "updated_at": "Updated At",
-                    "owner_username": "Owner Username",
-                }
-            )
-            st.markdown("#### Tickets for this Property")
-            st.dataframe(
-                df_t[["Ticket ID", "Title", "Status", "Owner Username", "Created At", "Updated At"]],
-                use_container_width=True,
-            )
-        else:
-            st.info("No tickets for this property.")
+    # Consolidated Excel download
+    st.markdown("#### Download Consolidated Excel Report")
+    _lazy_excel_download(
+        "consolidated",
+        _consolidated_excel_bytes,
+        "⬇️ Download Consolidated Report",
+        "landscaping_consolidated_report.xlsx",
+    )
 
-        excel_buffer = generate_property_excel(property_id)
-        safe_name = prop["name"].replace(" ", "_").replace("/", "_") if prop else f"property_{property_id}"
-        st.markdown("#### Download Property Excel Report")
-        st.download_button(
-            "⬇️ Download Property Report",
-            data=excel_buffer,
-            file_name=f"{safe_name}_report.xlsx",
-            mime=(
-                "application/vnd.openxmlformats-officedocument."
-                "spreadsheetml.sheet"
-            ),
+
+@st.fragment
+def _report_per_property() -> None:
+    """Per-property report."""
+    import pandas as pd
+
+    st.subheader("Per-Property Report")
+
+    properties = cache_layer.cached_properties()
+    if not properties:
+        st.warning("No properties found.")
+        return
+
+    property_options = {p["name"]: p["id"] for p in properties}
+    selected_name = st.selectbox("Select a property", list(property_options.keys()))
+    property_id = property_options[selected_name]
+
+    prop = cache_layer.cached_property(property_id)
+    summary = cache_layer.cached_property_summary(property_id)
+    services = cache_layer.cached_services(property_id)
+    tickets = cache_layer.cached_property_tickets(property_id) if prop else []
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        st.metric("Total Services (No. of Times)", summary["total_services"])
+    with c2:
+        st.metric("Total Annual Cost", f"${summary['total_cost']:,.2f}")
+    with c3:
+        st.metric("Tickets (All Statuses)", len(tickets))
+
+    if services:
+        df = pd.DataFrame(services)
+        df = df.rename(
+            columns={
+                "category": "Category",
+                "frequency": "Frequency",
+                "times_per_year": "No. of Times",
+                "each_time_cost": "Each Time Cost",
+                "status": "Status",
+                "start_date": "Start Date",
+                "end_date": "End Date",
+                "total_cost": "Total Cost",
+            }
+        )
+        df = _as_categories(_with_service_defaults(df), ("Category", "Frequency", "Status"))
+        st.markdown("#### Services for this Property")
+        st.dataframe(
+            df[["Category", "Frequency", "No. of Times", "Each Time Cost", "Status", "Start Date", "End Date", "Total Cost"]],
+            use_container_width=True,
+            column_config={
+                "Each Time Cost": st.column_config.NumberColumn(format="$%.2f"),
+                "Total Cost": st.column_config.NumberColumn(format="$%.2f"),
+            },
         )
+    else:
+        st.info("No services found for this property.")
 
-    else:  # Per Owner
-        st.subheader("Per-Owner Report")
+    if tickets:
+        df_t = pd.DataFrame(tickets)
+        df_t = df_t.rename(
+            columns={
+                "id": "Ticket ID",
+                "title": "Title",
+                "status": "Status",
+                "created_at": "Created At",
+                "updated_at": "Updated At",
+                "owner_username": "Owner Username",
+            }
+        )
+        df_t = _as_categories(df_t, ("Status",))
+        st.markdown("#### Tickets for this Property")
+        st.dataframe(
+            df_t[["Ticket ID", "Title", "Status", "Owner Username", "Created At", "Updated At"]],
+            use_container_width=True,
+        )
+    else:
+        st.info("No tickets for this property.")
+
+    safe_name = prop["name"].replace(" ", "_").replace("/", "_") if prop else f"property_{property_id}"
+    st.markdown("#### Download Property Excel Report")
+    _lazy_excel_download(
+        f"property_{property_id}",
+        lambda: _property_excel_bytes(property_id),
+        "⬇️ Download Property Report",
+        f"{safe_name}_report.xlsx",
+    )
 
-        owners = db.list_users(role="owner")
-        if not owners:
-            st.info("No owners found.")
-            return
 
-        owner_label_map = {
-            f"{o['full_name']} ({o['username']}) - {o.get('property_name') or 'No property'}": o
-            for o in owners
-        }
-        selected_label = st.selectbox("Select an owner", list(owner_label_map.keys()))
-        owner = owner_label_map[selected_label]
-
-        property_id = owner.get("property_id")
-        if not property_id:
-            st.warning("This owner is not yet mapped to any property.")
-            return
-
-        prop = db.get_property_by_id(property_id)
-        summary = db.get_property_summary(property_id)
-        services = db.get_services_for_property(property_id)
-        tickets = db.list_tickets_for_owner(owner["id"])
-
-        c1, c2, c3 = st.columns(3)
-        with c1:
-            st.metric("Property", prop["name"] if prop else "N/A")
-        with c2:
-            st.metric("Total Services (No. of Times)", summary["total_services"])
-        with c3:
-            st.metric("Total Annual Cost", f"${summary['total_cost']:,.2f}")
-
-        if services:
-            df = pd.DataFrame(services)
-            df["Total Cost"] = df["times_per_year"] * df["each_time_cost"]
-            df = df.rename(
-                columns={
-                    "category": "Category",
-                    "frequency": "Frequency",
-                    "times_per_year": "No. of Times",
-                    "each_time_cost": "Each Time Cost",
-                    "status": "Status",
-                    "start_date": "Start Date",
-                    "end_date": "End Date",
-                }
-            )
-            st.markdown("#### Services for Owner's Property")
-            st.dataframe(
-                df[["Category", "Frequency", "No. of Times", "Each Time Cost", "Status", "Start Date", "End Date", "Total Cost"]].style.format(
-                    {
-                        "Each Time Cost": "${:,.2f}".format,
-                        "Total Cost": "${:,.2f}".format,
-                    }
-                ),
-                use_container_width=True,
-            )
-        else:
-            st.info("No services found for this property.")
-
-        if tickets:
-            df_t = pd.DataFrame(tickets)
-            df_t = df_t.rename(
-                columns={
-                    "id": "Ticket ID",
-                    "title": "Title",
-                    "status": "Status",
-                    "created_at": "Created At",
-                    "updated_at": "Updated At",
-                }
-            )
-            st.markdown("#### Tickets from this Owner")
-            st.dataframe(
-                df_t[["Ticket ID", "Title", "Status", "Created At", "Updated At"]],
-                use_container_width=True,
-            )
-        else:
-            st.info("No tickets raised by this owner.")
+@st.fragment
+def _report_per_owner() -> None:
+    """Per-owner report."""
+    import pandas as pd
 
-        excel_buffer = generate_property_excel(property_id)
-        safe_name = (prop["name"] if prop else f"owner_{owner['username']}").replace(" ", "_").replace("/", "_")
-        st.markdown("#### Download Owner Property Report")
-        st.download_button(
-            "⬇️ Download Owner's Property Report",
-            data=excel_buffer,
-            file_name=f"{safe_name}_owner_report.xlsx",
-            mime=(
-                "application/vnd.openxmlformats-officedocument."
-                "spreadsheetml.sheet"
-            ),
+    st.subheader("Per-Owner Report")
+
+    owners = cache_layer.cached_users("owner")
+    if not owners:
+        st.info("No owners found.")
+        return
+
+    owner_label_map = {
+        f"{o['full_name']} ({o['username']}) - {o.get('property_name') or 'No property'}": o
+        for o in owners
+    }
+    selected_label = st.selectbox("Select an owner", list(owner_label_map.keys()))
+    owner = owner_label_map[selected_label]
+
+    property_id = owner.get("property_id")
+    if not property_id:
+        st.warning("This owner is not yet mapped to any property.")
+        return
+
+    prop = cache_layer.cached_property(property_id)
+    summary = cache_layer.cached_property_summary(property_id)
+    services = cache_layer.cached_services(property_id)
+    tickets = cache_layer.cached_owner_tickets(owner["id"])
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        st.metric("Property", prop["name"] if prop else "N/A")
+    with c2:
+        st.metric("Total Services (No. of Times)", summary["total_services"])
+    with c3:
+        st.metric("Total Annual Cost", f"${summary['total_cost']:,.2f}")
+
+    if services:
+        df = pd.DataFrame(services)
+        df = df.rename(
+            columns={
+                "category": "Category",
+                "frequency": "Frequency",
+                "times_per_year": "No. of Times",
+                "each_time_cost": "Each Time Cost",
+                "status": "Status",
+                "start_date": "Start Date",
+                "end_date": "End Date",
+                "total_cost": "Total Cost",
+            }
+        )
+        df = _as_categories(_with_service_defaults(df), ("Category", "Frequency", "Status"))
+        st.markdown("#### Services for Owner's Property")
+        st.dataframe(
+            df[["Category", "Frequency", "No. of Times", "Each Time Cost", "Status", "Start Date", "End Date", "Total Cost"]],
+            use_container_width=True,
+            column_config={
+                "Each Time Cost": st.column_config.NumberColumn(format="$%.2f"),
+                "Total Cost": st.column_config.NumberColumn(format="$%.2f"),
+            },
         )
+    else:
+        st.info("No services found for this property.")
+
+    if tickets:
+        # Same cached records owner_tickets() walks; only the shown columns
+        # are copied into the frame
+        df_t = pd.DataFrame.from_records(
+            [
+                (t["id"], t["title"], t["status"], t["created_at"], t["updated_at"])
+                for t in tickets
+            ],
+            columns=["Ticket ID", "Title", "Status", "Created At", "Updated At"],
+        )
+        df_t = _as_categories(df_t, ("Status",))
+        st.markdown("#### Tickets from this Owner")
+        st.dataframe(df_t, use_container_width=True)
+    else:
+        st.info("No tickets raised by this owner.")
+
+    safe_name = (prop["name"] if prop else f"owner_{owner['username']}").replace(" ", "_").replace("/", "_")
+    st.markdown("#### Download Owner Property Report")
+    _lazy_excel_download(
+        f"owner_{owner['id']}",
+        lambda: _property_excel_bytes(property_id),
+        "⬇️ Download Owner's Property Report",
+        f"{safe_name}_owner_report.xlsx",
+    )
+
+
+def admin_reports(user: Dict[str, Any]):
+    st.title("📑 Reports")
 
+    mode = st.radio(
+        "Report Type",
+        ["Consolidated (All Properties)", "Per Property", "Per Owner"],
+        horizontal=True,
+    )
 
+    if mode == "Consolidated (All Properties)":
+        _report_consolidated()
+    elif mode == "Per Property":
+        _report_per_property()
+    else:  # Per Owner
+        _report_per_owner()
 
 
 def admin_user_management(user: Dict[str, Any]):
@@ -1876,10 +2194,13 @@ def admin_user_management(user: Dict[str, Any]):
         "Passwords are stored as secure hashes in the database."
     )
 
-    properties = db.get_all_properties()
+    properties = cache_layer.cached_property_options()
     property_options = {"-- None --": None}
     for p in properties:
         property_options[f"{p['name']} (id={p['id']})"] = p["id"]
+    # Built once so each user's editor finds its preselected option in O(1)
+    property_labels = list(property_options.keys())
+    property_index_by_id = {pid: i for i, pid in enumerate(property_options.values())}
 
     # --- Add New User ---
     with st.expander("➕ Add New User"):
@@ -1894,7 +2215,7 @@ def admin_user_management(user: Dict[str, Any]):
                 phone = st.text_input("Mobile Number")
             property_label = st.selectbox(
                 "Property (for owners)",
-                options=list(property_options.keys()),
+                options=property_labels,
                 index=0,
                 help="If role is 'owner', select the property this user owns.",
             )
@@ -1912,12 +2233,12 @@ def admin_user_management(user: Dict[str, Any]):
                             db.add_user(
                                 username=username,
                                 full_name=full_name,
-                                email=email,
                                 role=role,
                                 password=password,
                                 property_id=prop_id,
-                                phone=phone,
                             )
+                            cache_layer.cached_users.clear()
+                            generate_consolidated_excel_cached.clear()
                             st.success("User created successfully.")
                             st.rerun()
                         except Exception as e:
@@ -1925,27 +2246,25 @@ def admin_user_management(user: Dict[str, Any]):
 
     # --- Existing Users ---
     st.markdown("### Existing Users")
-    users = db.list_users(role=None)
+    users = cache_layer.cached_users(None)
     if not users:
         st.info("No users found in the system.")
         return
 
-    df_users = []
-    for u in users:
-        df_users.append(
-            {
-                "Username": u["username"],
-                "Full Name": u["full_name"],
-                "Role": u["role"],
-                "Email": u["email"],
-                "Phone": u["phone"],
-                "Property": u.get("property_name") or "",
-            }
-        )
-    st.dataframe(
-        pd.DataFrame(df_users),
-        use_container_width=True,
+    import pandas as pd
+
+    df_users = pd.DataFrame(
+        {
+            "Username": [u["username"] for u in users],
+            "Full Name": [u["full_name"] for u in users],
+            "Role": [u["role"] for u in users],
+            "Email": [u.get("email") for u in users],
+            "Phone": [u.get("phone") for u in users],
+            "Property": [u.get("property_name") or "" for u in users],
+        }
     )
+    df_users = _as_categories(df_users, ("Role",))
+    st.dataframe(df_users, use_container_width=True)
 
     st.markdown("### ✏️ Edit / Delete Users")
     for u in users:
@@ -1963,12 +2282,12 @@ def admin_user_management(user: Dict[str, Any]):
                         index=["owner", "admin"].index(u["role"]) if u["role"] in ["owner", "admin"] else 0,
                     )
                 with col2:
-                    email_edit = st.text_input("Email", value=u["email"] or "")
-                    phone_edit = st.text_input("Mobile Number", value=u["phone"] or "")
+                    email_edit = st.text_input("Email", value=u.get("email") or "")
+                    phone_edit = st.text_input("Mobile Number", value=u.get("phone") or "")
                 property_label_edit = st.selectbox(
                     "Property (for owners)",
-                    options=list(property_options.keys()),
-                    index=list(property_options.values()).index(u["property_id"]) if u["property_id"] in property_options.values() else 0,
+                    options=property_labels,
+                    index=property_index_by_id.get(u["property_id"], 0),
                 )
                 new_password = st.text_input(
                     "New Password (leave blank to keep current)",
@@ -1987,12 +2306,12 @@ def admin_user_management(user: Dict[str, Any]):
                             db.update_user(
                                 user_id=u["id"],
                                 full_name=full_name_edit,
-                                email=email_edit,
                                 role=role_edit,
                                 property_id=prop_id_edit,
-                                phone=phone_edit,
                                 new_password=new_password or None,
                             )
+                            cache_layer.cached_users.clear()
+                            generate_consolidated_excel_cached.clear()
                             st.success("User updated successfully.")
                             st.rerun()
                         except Exception as e:
@@ -2006,6 +2325,8 @@ def admin_user_management(user: Dict[str, Any]):
                     else:
                         try:
                             db.delete_user(u["id"])
+                            cache_layer.cached_users.clear()
+                            generate_consolidated_excel_cached.clear()
                             st.success("User deleted successfully.")
                             st.rerun()
                         except Exception as e:
@@ -2020,7 +2341,7 @@ def owner_dashboard(user: Dict[str, Any]):
         st.warning("No property assigned to this user.")
         return
 
-    prop = db.get_property_by_id(property_id)
+    prop = cache_layer.cached_property(property_id)
     if not prop:
         st.error("Assigned property not found in DB.")
         return
@@ -2033,7 +2354,7 @@ def owner_dashboard(user: Dict[str, Any]):
         st.write(f"**City/State/ZIP:** {prop['city']}, {prop['state']} {prop['zip']}")
 
     with col_summary:
-        summary = db.get_property_summary(property_id)
+        summary = cache_layer.cached_property_summary(property_id)
         st.subheader("Summary")
         st.metric("Total Services (No. of Times)", summary["total_services"])
         st.metric(
@@ -2042,7 +2363,7 @@ def owner_dashboard(user: Dict[str, Any]):
         )
 
         # Excel export
-        excel_buffer = generate_property_excel(property_id)
+        excel_buffer = _property_excel_bytes(property_id)
         safe_name = prop['name'].replace(" ", "_").replace("/", "_")
         st.download_button(
             "⬇️ Download Excel for my property",
@@ -2055,50 +2376,23 @@ def owner_dashboard(user: Dict[str, Any]):
         )
 
     st.markdown("### Services for My Property")
-    services = db.get_services_for_property(property_id)
-    services = [dict(s) for s in services]
+    services = cache_layer.cached_services(property_id)
     if services:
-        svc_df = pd.DataFrame(services)
-        svc_df["Total Cost"] = svc_df["times_per_year"] * svc_df["each_time_cost"]
-        svc_df = svc_df.rename(
-            columns={
-                "category": "Category",
-                "frequency": "Frequency",
-                "times_per_year": "No. of Times",
-                "each_time_cost": "Each Time Cost",
-                "status": "Status",
-                "start_date": "Start Date",
-                "end_date": "End Date",
-            }
-        )
+        svc_df = _services_frame(services)
         st.dataframe(
-            svc_df.style.format(
-                {
-                    "Each Time Cost": "${:,.2f}".format,
-                    "Total Cost": "${:,.2f}".format,
-                }
-            ),
+            svc_df,
             use_container_width=True,
+            column_config={
+                "Each Time Cost": st.column_config.NumberColumn(format="$%.2f"),
+                "Total Cost": st.column_config.NumberColumn(format="$%.2f"),
+            },
         )
     else:
         st.info("No services configured yet for your property.")
 
     st.markdown("### 📎 Attachments by Service")
     if services:
-        for s in services:
-            attachments = db.get_service_attachments(s["id"])
-            if not attachments:
-                continue
-            with st.expander(
-                f"{s['category']} ({s['frequency']}) — Status: {s.get('status','Scheduled')}"
-            ):
-                for att in attachments:
-                    st.write(
-                        f"**{att['file_name']}** "
-                        f"(uploaded {att['uploaded_at']}, by {att['uploaded_by']})"
-                    )
-                    if att["file_path"] and os.path.exists(att["file_path"]):
-                        st.image(att["file_path"], width=250)
+        _render_attachments_by_service(property_id, services)
 
     st.markdown("---")
     render_chat(user)
@@ -2131,11 +2425,13 @@ def owner_tickets(user: Dict[str, Any]):
                     title=title,
                     description=description,
                 )
+                cache_layer.clear_ticket_caches()
+                generate_consolidated_excel_cached.clear()
                 st.success("Ticket submitted successfully.")
                 st.rerun()
 
     st.markdown("### Existing Tickets")
-    tickets = db.list_tickets_for_owner(user["id"])
+    tickets = cache_layer.cached_owner_tickets(user["id"])
     if not tickets:
         st.info("You have not created any tickets yet.")
         return
@@ -2154,6 +2450,38 @@ def owner_tickets(user: Dict[str, Any]):
 
 # ---------- Main Router ----------
 
+# (label, url path, page function). Pages taking no arguments are wrapped so
+# every entry is called the same way.
+ADMIN_PAGES = [
+    ("Admin Dashboard", "admin_dashboard", admin_dashboard),
+    ("Manage Properties & Services", "manage_properties", admin_manage_properties),
+    ("Price Master", "price_master", lambda user: admin_price_master()),
+    ("Service Personnel", "service_personnel", admin_service_personnel),
+    ("Event Scheduler", "event_scheduler", admin_event_scheduler),
+    ("Reports", "reports", admin_reports),
+    ("User Management", "user_management", admin_user_management),
+    ("Tickets", "tickets", lambda user: admin_tickets()),
+]
+
+OWNER_PAGES = [
+    ("My Property Dashboard", "my_dashboard", owner_dashboard),
+    ("My Tickets", "my_tickets", owner_tickets),
+]
+
+
+def _build_pages(pages, user: Dict[str, Any]):
+    """st.Page entries; only the selected page's function runs on a rerun."""
+    return [
+        st.Page(
+            (lambda fn=fn: fn(user)),
+            title=label,
+            url_path=url_path,
+            default=(i == 0),
+        )
+        for i, (label, url_path, fn) in enumerate(pages)
+    ]
+
+
 def main():
     user = st.session_state.user
 
@@ -2161,66 +2489,17 @@ def main():
         login_page()
         return
 
-    # Sidebar nav
+    pages = ADMIN_PAGES if user["role"] == "admin" else OWNER_PAGES
+    pg = st.navigation({"Navigation": _build_pages(pages, user)})
+
     with st.sidebar:
+        st.markdown("---")
         st.markdown("### 👤 Logged in as")
         st.write(f"**{user['full_name']}**")
         st.write(f"Role: `{user['role']}`")
+        st.button("Logout", on_click=logout)
 
-        st.markdown("---")
-
-        if user["role"] == "admin":
-            page = st.radio(
-                "Navigation",
-                [
-                    "Admin Dashboard",
-                    "Manage Properties & Services",
-                    "Price Master",
-                    "Service Personnel",
-                    "Event Scheduler",
-                    "Reports",
-                    "User Management",
-                    "Tickets",
-                    "Logout",
-                ],
-            )
-        else:
-            page = st.radio(
-                "Navigation",
-                [
-                    "My Property Dashboard",
-                    "My Tickets",
-                    "Logout",
-                ],
-            )
-
-    if page == "Logout":
-        logout()
-        st.rerun()
-        return
-
-    if user["role"] == "admin":
-        if page == "Admin Dashboard":
-            admin_dashboard(user)
-        elif page == "Manage Properties & Services":
-            admin_manage_properties(user)
-        elif page == "Price Master":
-            admin_price_master()
-        elif page == "Service Personnel":
-            admin_service_personnel(user)
-        elif page == "Event Scheduler":
-            admin_event_scheduler(user)
-        elif page == "Reports":
-            admin_reports(user)
-        elif page == "User Management":
-            admin_user_management(user)
-        elif page == "Tickets":
-            admin_tickets()
-    else:
-        if page == "My Property Dashboard":
-            owner_dashboard(user)
-        elif page == "My Tickets":
-            owner_tickets(user)
+    pg.run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+"""Cached read helpers for the Streamlit pages.
+
+Streamlit re-executes the page on every widget interaction, so reading
+straight from ``db`` means a full set of SQLite queries per keystroke. These
+wrappers memoise the read-only helpers for a short TTL; call
+``clear_property_caches()`` after any write that touches properties or their
+services.
+
+Helpers that already return fresh dicts are cached as-is; those returning
+``sqlite3.Row`` objects are converted once here, since cached values must be
+picklable.
+"""
+from typing import Any, Dict, List, Optional
+
+import streamlit as st
+
+import db
+
+_TTL_SECONDS = 60
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_properties() -> List[Dict[str, Any]]:
+    return db.get_all_properties()
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_properties_summary() -> List[Dict[str, Any]]:
+    return [dict(r) for r in db.get_properties_summary()]
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_portfolio_totals() -> Dict[str, Any]:
+    return db.get_portfolio_totals()
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_frequency_summary() -> List[Dict[str, Any]]:
+    return [dict(r) for r in db.get_frequency_summary()]
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_property(property_id: int) -> Optional[Dict[str, Any]]:
+    return db.get_property_by_id(property_id)
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_property_summary(property_id: int) -> Dict[str, Any]:
+    return dict(db.get_property_summary(property_id))
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_services(property_id: int) -> List[Dict[str, Any]]:
+    return db.get_services_for_property(property_id)
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_price_master() -> List[Dict[str, Any]]:
+    return db.get_price_master_all()
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_price_category_index() -> Dict[str, List[str]]:
+    """Price master categories (sorted) mapped to their sorted frequencies."""
+    idx: Dict[str, set] = {}
+    for r in db.get_price_master_all():
+        idx.setdefault(r["category"], set()).add(r["frequency"])
+    return {c: sorted(fs) for c, fs in sorted(idx.items())}
+
+
+def clear_price_master_caches() -> None:
+    """Drop cached price master reads after a write."""
+    cached_price_master.clear()
+    cached_price_category_index.clear()
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_service_persons() -> List[Dict[str, Any]]:
+    return db.get_all_service_persons()
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_all_services_with_property() -> List[Dict[str, Any]]:
+    return [dict(s) for s in db.get_all_services_with_property()]
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_users(role: Optional[str] = None) -> List[Dict[str, Any]]:
+    return db.list_users_with_property(role)
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_property_options() -> List[Dict[str, Any]]:
+    return [dict(r) for r in db.get_property_options()]
+
+
+def _ticket_record(row) -> Dict[str, Any]:
+    """Ticket row with the field names the ticket pages read.
+
+    The tickets table stores ``subject``; ``title``, ``owner_username`` and
+    ``admin_comment`` are filled in when the query doesn't provide them.
+    """
+    t = dict(row)
+    t.setdefault("title", t.get("subject"))
+    t.setdefault("owner_username", t.get("owner_name"))
+    t.setdefault("admin_comment", None)
+    return t
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_all_tickets() -> List[Dict[str, Any]]:
+    return [_ticket_record(t) for t in db.get_all_tickets()]
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_property_tickets(property_id: int) -> List[Dict[str, Any]]:
+    return [_ticket_record(t) for t in db.get_tickets_for_property(property_id)]
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_owner_tickets(owner_id: int) -> List[Dict[str, Any]]:
+    return [_ticket_record(t) for t in db.get_tickets_for_owner(owner_id)]
+
+
+@st.cache_data(ttl=_TTL_SECONDS, show_spinner=False)
+def cached_events(from_iso: str, to_iso: str) -> List[Dict[str, Any]]:
+    return db.get_scheduled_events(from_iso, to_iso)
+
+
+def clear_property_caches() -> None:
+    """Drop cached property/service reads after a write."""
+    cached_properties.clear()
+    cached_property_options.clear()
+    cached_properties_summary.clear()
+    cached_portfolio_totals.clear()
+    cached_frequency_summary.clear()
+    cached_property.clear()
+    cached_property_summary.clear()
+    cached_services.clear()
+    cached_all_services_with_property.clear()
+    # User rows carry their property's name
+    cached_users.clear()
+
+
+def clear_ticket_caches() -> None:
+    """Drop cached ticket reads after a ticket is created or updated."""
+    cached_all_tickets.clear()
+    cached_property_tickets.clear()
+    cached_owner_tickets.clear()
@@ -1,31 +1,248 @@
 
 import sqlite3
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 import datetime
+import functools
+import hashlib
+import hmac
+import itertools
+import json
 import os
+import queue
+import secrets
+import threading
+import time
 
 DB_PATH = Path("landscaping.db")
 
+# DB paths already initialised in this interpreter. Kept here rather than in
+# app.py because Streamlit re-executes the main script on every rerun.
+_initialized_paths: set = set()
+_init_lock = threading.Lock()
 
-def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+# Stored in the database's PRAGMA user_version once init_db() has created and
+# seeded it. Bump whenever the schema, migrations or seed data change so
+# existing databases run init_db() again.
+SCHEMA_VERSION = 1
+
+# Seeded standard services: catalog code -> (frequency label, price per visit)
+_STANDARD_SERVICE_PLANS = {
+    "WEED_CONTROL": ("3 Times / Year", 85.0),
+    "MOWING": ("Weekly (22 Visits)", 60.0),
+    "BLOWING": ("Weekly (22 Visits)", 15.0),
+    "FERTILIZER": ("5 Times / Year", 80.0),
+    "TREE_SHRUB": ("Twice / Year", 120.0),
+    "MULCH": ("Every 6 Months", 600.0),
+}
+
+
+# Open connections shared by every thread. Streamlit starts a new script
+# thread for each rerun, so a per-thread cache would still reopen the file on
+# every interaction; a process-wide pool keeps connections (and their page
+# caches) warm across reruns and sessions.
+_POOL_SIZE = 8
+_pool: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue(maxsize=_POOL_SIZE)
+
+
+class _PooledConnection(sqlite3.Connection):
+    """Connection whose ``close()`` hands it back to the pool.
+
+    Helpers keep their ``conn.close()`` calls; only ``really_close()`` shuts
+    the underlying handle.
+    """
+
+    db_path: Path
+    in_pool: bool
+
+    def close(self) -> None:
+        _release(self)
+
+    def really_close(self) -> None:
+        super().close()
+
+
+def _configure_connection(conn: sqlite3.Connection) -> None:
+    """Per-connection tuning, applied once when a pooled connection is opened.
+
+    WAL is persistent in the DB file (init_db sets it, this just makes sure);
+    the rest reset with every new connection. NORMAL sync is safe under WAL
+    and drops the extra fsync per commit.
+    """
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+
+
+def _acquire() -> _PooledConnection:
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            break
+        conn.in_pool = False
+        if conn.db_path == DB_PATH:
+            return conn
+        conn.really_close()  # DB_PATH was repointed since it was pooled
+    # Pooled connections live for the whole process, so their prepared
+    # statement cache stays warm; size it above the number of distinct
+    # queries in this module. The cache is keyed by SQL text, and every
+    # helper passes a constant literal with ``?`` parameters, so repeated
+    # calls already reuse the compiled statement without hoisting the SQL
+    # into module-level constants.
+    conn = sqlite3.connect(
+        DB_PATH,
+        factory=_PooledConnection,
+        check_same_thread=False,
+        cached_statements=256,
+    )
     conn.row_factory = sqlite3.Row
+    _configure_connection(conn)
+    conn.db_path = DB_PATH
+    conn.in_pool = False
     return conn
 
 
+def _release(conn: _PooledConnection) -> None:
+    if conn.in_pool:
+        return  # closed twice; it must not be handed out twice
+    if conn.in_transaction:
+        # Uncommitted writes must not leak into the next borrower
+        conn.rollback()
+    if conn.db_path != DB_PATH:
+        conn.really_close()
+        return
+    conn.in_pool = True
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.in_pool = False
+        conn.really_close()
+
+
+def get_connection() -> sqlite3.Connection:
+    """Borrow a pooled connection; ``close()`` returns it to the pool."""
+    return _acquire()
+
+
+def _utc_now() -> str:
+    """Current UTC time as ``YYYY-MM-DDTHH:MM:SS``, the format stored in every timestamp column."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+
+
+_PBKDF2_ITERATIONS = 600_000
+
+
+def _pbkdf2_hex(password: str, salt: str, iterations: int) -> str:
+    return hashlib.pbkdf2_hmac(
+        "sha256", password.encode("utf-8"), salt.encode("utf-8"), iterations
+    ).hex()
+
+
+def hash_password(password: str, salt: Optional[str] = None, iterations: int = _PBKDF2_ITERATIONS) -> str:
+    """Return a PBKDF2-HMAC-SHA256 hash stored as ``pbkdf2$<iters>$<salt>$<hex>``."""
+    if salt is None:
+        salt = secrets.token_hex(16)
+    return f"pbkdf2${iterations}${salt}${_pbkdf2_hex(password, salt, iterations)}"
+
+
+def verify_password(password: str, password_hash: Optional[str]) -> bool:
+    """Check a password against a stored hash using a constant-time compare."""
+    if not password_hash:
+        return False
+    parts = password_hash.split("$")
+    if len(parts) == 4 and parts[0] == "pbkdf2":
+        _, iterations, salt, digest = parts
+        try:
+            candidate = _pbkdf2_hex(password, salt, int(iterations))
+        except ValueError:
+            return False
+    elif len(parts) == 2:
+        # Legacy single-round salted SHA-256 (``salt$hexdigest``)
+        salt, digest = parts
+        candidate = hashlib.sha256((salt + password).encode("utf-8")).hexdigest()
+    else:
+        # Legacy unsalted SHA-256 hex digests
+        digest = password_hash
+        candidate = hashlib.sha256(password.encode("utf-8")).hexdigest()
+    return hmac.compare_digest(candidate, digest)
+
+
+def rehash_password_if_needed(user_id: int, password: str, password_hash: Optional[str]) -> bool:
+    """Upgrade a legacy (or lower-iteration) hash after a successful login.
+
+    Call only once ``verify_password`` has accepted ``password``. Returns True
+    if the stored hash was replaced.
+    """
+    parts = (password_hash or "").split("$")
+    current = len(parts) == 4 and parts[0] == "pbkdf2" and parts[1].isdigit()
+    if current and int(parts[1]) >= _PBKDF2_ITERATIONS:
+        return False
+    conn = get_connection()
+    cur = conn.cursor()
+    # Only replace the hash we verified against, not one changed meanwhile
+    cur.execute(
+        "UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?",
+        (hash_password(password), user_id, password_hash),
+    )
+    conn.commit()
+    updated = cur.rowcount > 0
+    conn.close()
+    if updated:
+        _invalidate_user_cache()
+    return updated
+
+
+def _migrate_user_passwords(cur: sqlite3.Cursor) -> None:
+    """Replace the legacy plaintext ``users.password`` column with ``password_hash``."""
+    cur.execute("PRAGMA table_info(users)")
+    columns = {r["name"] for r in cur.fetchall()}
+    if "password_hash" in columns or "password" not in columns:
+        return
+
+    cur.execute("ALTER TABLE users ADD COLUMN password_hash TEXT")
+    cur.execute("SELECT id, password FROM users")
+    for row in cur.fetchall():
+        cur.execute(
+            "UPDATE users SET password_hash = ? WHERE id = ?",
+            (hash_password(row["password"] or ""), row["id"]),
+        )
+    try:
+        cur.execute("ALTER TABLE users DROP COLUMN password")
+    except sqlite3.OperationalError:
+        # SQLite < 3.35 can't drop columns; at least don't keep the plaintext around
+        cur.execute("UPDATE users SET password = ''")
+
+
 def init_db() -> None:
-    """Create tables and seed initial data if needed."""
+    """Create tables and seed initial data if needed.
+
+    A database already stamped with ``SCHEMA_VERSION`` is left untouched.
+    """
     conn = get_connection()
     cur = conn.cursor()
 
+    # WAL and the other PRAGMAs are applied by _configure_connection() when
+    # the pooled connection is opened.
+
+    cur.execute("PRAGMA user_version")
+    if cur.fetchone()[0] == SCHEMA_VERSION:
+        conn.close()
+        return
+
+    # Schema, migrations and seed data go in one transaction: one fsync on
+    # first run instead of one per section.
+    cur.execute("BEGIN")
+
     # Users
     cur.execute(
         """
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             username TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
+            password_hash TEXT NOT NULL,
             full_name TEXT,
             role TEXT NOT NULL,           -- 'admin' or 'owner'
             property_id INTEGER,
@@ -33,6 +250,8 @@ def init_db() -> None:
         )
         """
     )
+    _migrate_user_passwords(cur)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_users_role_prop ON users(role, property_id)")
 
     # Properties
     cur.execute(
@@ -67,6 +286,15 @@ def init_db() -> None:
         )
         """
     )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_ps_property ON property_services(property_id)")
+    # Services with their annual cost, so readers don't multiply it out themselves
+    cur.execute(
+        """
+        CREATE VIEW IF NOT EXISTS v_property_services AS
+        SELECT ps.*, ps.times_per_year * ps.each_time_cost AS total_cost
+        FROM property_services ps
+        """
+    )
 
     # Service personnel
     cur.execute(
@@ -114,6 +342,12 @@ def init_db() -> None:
         )
         """
     )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_se_prop_svc_date"
+        " ON service_events(property_id, service_id, scheduled_date)"
+    )
+    # Year / calendar-window range scans that aren't scoped to one property
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_se_date ON service_events(scheduled_date)")
 
     # Tickets
     cur.execute(
@@ -132,6 +366,8 @@ def init_db() -> None:
         )
         """
     )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_tickets_property ON tickets(property_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_tickets_owner ON tickets(owner_id)")
 
     # Ticket attachments
     cur.execute(
@@ -148,6 +384,21 @@ def init_db() -> None:
         """
     )
 
+    # Service attachments (photos uploaded against a property service)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS service_attachments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            service_id INTEGER NOT NULL,
+            file_name TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            uploaded_by TEXT,
+            uploaded_at TEXT NOT NULL
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_service_attachments_service ON service_attachments(service_id)")
+
     # Regions for quoting
     cur.execute(
         """
@@ -188,26 +439,26 @@ def init_db() -> None:
         )
         """
     )
-
-    conn.commit()
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rsr_region_code ON region_service_rates(region_id, service_code)"
+    )
 
     # ---- Seed data if needed ----
-    now = datetime.datetime.utcnow().isoformat(timespec="seconds")
+    now = _utc_now()
 
     # Seed users
-    cur.execute("SELECT COUNT(*) FROM users")
-    if cur.fetchone()[0] == 0:
+    cur.execute("SELECT 1 FROM users LIMIT 1")
+    if cur.fetchone() is None:
         # Admin
         cur.execute(
-            "INSERT INTO users (username, password, full_name, role, created_at) VALUES (?,?,?,?,?)",
-            ("admin", "admin123", "System Admin", "admin", now),
+            "INSERT INTO users (username, password_hash, full_name, role, created_at) VALUES (?,?,?,?,?)",
+            ("admin", hash_password("admin123"), "System Admin", "admin", now),
         )
         # Owners will be added after properties exist
 
     # Seed properties if none
-    cur.execute("SELECT COUNT(*) FROM properties")
-    props_count = cur.fetchone()[0]
-    if props_count == 0:
+    cur.execute("SELECT 1 FROM properties LIMIT 1")
+    if cur.fetchone() is None:
         sample_props = [
             ("Oakridge Villas", "123 Oakridge Ln", "Frisco", "TX", "75034"),
             ("Maple Heights", "456 Maple St", "Plano", "TX", "75025"),
@@ -220,36 +471,35 @@ def init_db() -> None:
             ("Heritage Oaks Campus", "64 Heritage Oaks Blvd", "Frisco", "TX", "75034"),
             ("Stonebridge Court", "19 Stonebridge Ct", "McKinney", "TX", "75070"),
         ]
-        for name, addr, city, state, zip_code in sample_props:
-            cur.execute(
-                """
-                INSERT INTO properties
-                    (name, address, city, state, zip, annual_quote, annual_credited, annual_cost, created_at, updated_at)
-                VALUES (?,?,?,?,?,?,?,?,?,?)
-                """,
-                (name, addr, city, state, zip_code, 0.0, 0.0, 0.0, now, now),
-            )
-
-    conn.commit()
+        cur.executemany(
+            """
+            INSERT INTO properties
+                (name, address, city, state, zip, annual_quote, annual_credited, annual_cost, created_at, updated_at)
+            VALUES (?,?,?,?,?,?,?,?,?,?)
+            """,
+            [
+                (name, addr, city, state, zip_code, 0.0, 0.0, 0.0, now, now)
+                for name, addr, city, state, zip_code in sample_props
+            ],
+        )
 
     # Seed owners mapped to properties if none
-    cur.execute("SELECT COUNT(*) FROM users WHERE role = 'owner'")
-    owner_count = cur.fetchone()[0]
-    if owner_count == 0:
-        cur.execute("SELECT id, name FROM properties ORDER BY id")
+    cur.execute("SELECT 1 FROM users WHERE role = 'owner' LIMIT 1")
+    if cur.fetchone() is None:
+        # Not an INSERT ... SELECT: each owner needs its own salted hash, which
+        # SQLite can't compute, so the rows are built here and sent in one batch.
+        cur.execute("SELECT id FROM properties ORDER BY id")
         props = cur.fetchall()
-        idx = 1
-        for p in props:
-            username = f"owner{idx}"
-            full_name = f"Property Owner {idx}"
-            cur.execute(
-                """
-                INSERT INTO users (username, password, full_name, role, property_id, created_at)
-                VALUES (?,?,?,?,?,?)
-                """,
-                (username, "owner123", full_name, "owner", p["id"], now),
-            )
-            idx += 1
+        cur.executemany(
+            """
+            INSERT INTO users (username, password_hash, full_name, role, property_id, created_at)
+            VALUES (?,?,?,?,?,?)
+            """,
+            [
+                (f"owner{idx}", hash_password("owner123"), f"Property Owner {idx}", "owner", p["id"], now)
+                for idx, p in enumerate(props, start=1)
+            ],
+        )
 
     # Seed service catalog (standard 6 services)
     standard_services = [
@@ -260,55 +510,49 @@ def init_db() -> None:
         ("TREE_SHRUB", "Tree & Shrub Care", 2),
         ("MULCH", "Mulch", 2),
     ]
-    for code, name, times in standard_services:
-        cur.execute("SELECT id FROM service_catalog WHERE code = ?", (code,))
-        if not cur.fetchone():
-            cur.execute(
-                "INSERT INTO service_catalog (code, display_name, default_times_per_year) VALUES (?,?,?)",
-                (code, name, times),
-            )
+    # code is UNIQUE, so already-seeded rows are skipped by the constraint
+    cur.executemany(
+        "INSERT OR IGNORE INTO service_catalog (code, display_name, default_times_per_year) VALUES (?,?,?)",
+        standard_services,
+    )
+
+    # The tables below have no UNIQUE key (and existing databases may hold
+    # duplicates, so one can't be added); skip rows that exist with
+    # NOT EXISTS instead of a SELECT round trip per row.
 
     # Seed Frisco, TX, Small Industrial region
+    region_key = ("TX", "Frisco", "Small Industrial")
     cur.execute(
-        "SELECT id FROM regions WHERE state = ? AND city = ? AND property_type = ?",
-        ("TX", "Frisco", "Small Industrial"),
-    )
-    row = cur.fetchone()
-    if row:
-        region_id = row["id"]
-    else:
-        cur.execute(
-            """
-            INSERT INTO regions (state, city, property_type, labor_factor, material_factor)
-            VALUES (?,?,?,?,?)
-            """,
-            ("TX", "Frisco", "Small Industrial", 1.0, 1.0),
+        """
+        INSERT INTO regions (state, city, property_type, labor_factor, material_factor)
+        SELECT ?, ?, ?, 1.0, 1.0
+        WHERE NOT EXISTS (
+            SELECT 1 FROM regions WHERE state = ? AND city = ? AND property_type = ?
         )
-        region_id = cur.lastrowid
+        """,
+        region_key + region_key,
+    )
+    cur.execute(
+        "SELECT id FROM regions WHERE state = ? AND city = ? AND property_type = ? ORDER BY id LIMIT 1",
+        region_key,
+    )
+    region_id = cur.fetchone()["id"]
 
     # Seed region service rates for that region
-    region_rates = {
-        "WEED_CONTROL": 85.0,
-        "MOWING": 60.0,
-        "BLOWING": 15.0,
-        "FERTILIZER": 80.0,
-        "TREE_SHRUB": 120.0,
-        "MULCH": 600.0,
-    }
-    for code, price in region_rates.items():
-        cur.execute(
-            "SELECT id FROM region_service_rates WHERE region_id = ? AND service_code = ?",
-            (region_id, code),
+    cur.executemany(
+        """
+        INSERT INTO region_service_rates
+            (region_id, service_code, base_price_per_visit, min_sqft, max_sqft, active)
+        SELECT ?, ?, ?, 0, 8000, 1
+        WHERE NOT EXISTS (
+            SELECT 1 FROM region_service_rates WHERE region_id = ? AND service_code = ?
         )
-        if not cur.fetchone():
-            cur.execute(
-                """
-                INSERT INTO region_service_rates
-                    (region_id, service_code, base_price_per_visit, min_sqft, max_sqft, active)
-                VALUES (?,?,?,?,?,1)
-                """,
-                (region_id, code, price, 0, 8000),
-            )
+        """,
+        [
+            (region_id, code, price, region_id, code)
+            for code, (_, price) in _STANDARD_SERVICE_PLANS.items()
+        ],
+    )
 
     # Seed price master with generic entries
     price_rows = [
@@ -319,189 +563,280 @@ def init_db() -> None:
         ("Tree & Shrub Care", "Twice / Year", 120.0),
         ("Mulch", "Every 6 Months", 600.0),
     ]
-    for cat, freq, cost in price_rows:
-        cur.execute(
-            "SELECT id FROM price_master WHERE category = ? AND frequency = ?",
-            (cat, freq),
-        )
-        if not cur.fetchone():
-            cur.execute(
-                "INSERT INTO price_master (category, frequency, default_cost) VALUES (?,?,?)",
-                (cat, freq, cost),
-            )
-
-    conn.commit()
-
-    # Seed property services for each property if it has none
-    cur.execute("SELECT id, city, state FROM properties")
-    props_all = cur.fetchall()
-    for p in props_all:
-        cur.execute(
-            "SELECT COUNT(*) FROM property_services WHERE property_id = ?",
-            (p["id"],),
-        )
-        if cur.fetchone()[0] == 0:
-            # Add the 6 standard services
-            for code, name, times in standard_services:
-                # Map display names & frequency labels
-                if code == "WEED_CONTROL":
-                    freq = "3 Times / Year"
-                    price = region_rates["WEED_CONTROL"]
-                elif code == "MOWING":
-                    freq = "Weekly (22 Visits)"
-                    price = region_rates["MOWING"]
-                elif code == "BLOWING":
-                    freq = "Weekly (22 Visits)"
-                    price = region_rates["BLOWING"]
-                elif code == "FERTILIZER":
-                    freq = "5 Times / Year"
-                    price = region_rates["FERTILIZER"]
-                elif code == "TREE_SHRUB":
-                    freq = "Twice / Year"
-                    price = region_rates["TREE_SHRUB"]
-                elif code == "MULCH":
-                    freq = "Every 6 Months"
-                    price = region_rates["MULCH"]
-                else:
-                    freq = "Custom"
-                    price = 100.0
-
-                cur.execute(
-                    """
-                    INSERT INTO property_services
-                        (property_id, category, frequency, times_per_year, each_time_cost, notes)
-                    VALUES (?,?,?,?,?,?)
-                    """,
-                    (p["id"], name, freq, times, price, f"Standard {name} package"),
-                )
-
-    conn.commit()
+    cur.executemany(
+        """
+        INSERT INTO price_master (category, frequency, default_cost)
+        SELECT ?, ?, ?
+        WHERE NOT EXISTS (SELECT 1 FROM price_master WHERE category = ? AND frequency = ?)
+        """,
+        [(cat, freq, cost, cat, freq) for cat, freq, cost in price_rows],
+    )
 
-    # Update annual cost / quote / credited for each property
-    cur.execute("SELECT id FROM properties")
-    for row_p in cur.fetchall():
-        pid = row_p["id"]
-        cur.execute(
-            "SELECT times_per_year, each_time_cost FROM property_services WHERE property_id = ?",
-            (pid,),
-        )
-        svcs = cur.fetchall()
-        annual_cost = sum((s["times_per_year"] or 0) * (s["each_time_cost"] or 0.0) for s in svcs)
-        annual_quote = annual_cost * 1.3  # 30% markup
-        annual_credited = annual_quote * 0.95  # assume 95% realization
-        cur.execute(
-            """
-            UPDATE properties
-            SET annual_cost = ?, annual_quote = ?, annual_credited = ?, updated_at = ?
-            WHERE id = ?
-            """,
-            (annual_cost, annual_quote, annual_credited, now, pid),
+    # Seed property services for each property if it has none. The 6 standard
+    # services are the same for every property, so they are bound once as a
+    # multi-row VALUES list (6 x 6 parameters, far below SQLite's limit) and
+    # cross joined with the properties in a single INSERT.
+    standard_rows = []
+    for slot, (code, name, times) in enumerate(standard_services):
+        freq, price = _STANDARD_SERVICE_PLANS.get(code, ("Custom", 100.0))
+        standard_rows.append((slot, name, freq, times, price, f"Standard {name} package"))
+    cur.execute(
+        f"""
+        WITH standard (slot, category, frequency, times_per_year, each_time_cost, notes) AS (
+            VALUES {",".join(["(?,?,?,?,?,?)"] * len(standard_rows))}
         )
+        INSERT INTO property_services
+            (property_id, category, frequency, times_per_year, each_time_cost, notes)
+        SELECT p.id, s.category, s.frequency, s.times_per_year, s.each_time_cost, s.notes
+        FROM properties p CROSS JOIN standard s
+        WHERE NOT EXISTS (SELECT 1 FROM property_services ps WHERE ps.property_id = p.id)
+        ORDER BY p.id, s.slot
+        """,
+        [value for row in standard_rows for value in row],
+    )
 
-    conn.commit()
+    # Update annual cost / quote / credited for each property. SET expressions
+    # see the row's old values, so the new cost is written before the revenue
+    # derived from it.
+    cur.execute(
+        """
+        UPDATE properties
+        SET annual_cost = COALESCE((
+                SELECT SUM(COALESCE(ps.times_per_year, 0) * COALESCE(ps.each_time_cost, 0.0))
+                FROM property_services ps
+                WHERE ps.property_id = properties.id
+            ), 0.0),
+            updated_at = ?
+        """,
+        (now,),
+    )
+    cur.execute(
+        """
+        UPDATE properties
+        SET annual_quote = annual_cost * 1.3,            -- 30% markup
+            annual_credited = annual_cost * 1.3 * 0.95   -- assume 95% realization
+        """
+    )
 
     # Seed service persons
-    cur.execute("SELECT COUNT(*) FROM service_persons")
-    if cur.fetchone()[0] == 0:
+    cur.execute("SELECT 1 FROM service_persons LIMIT 1")
+    if cur.fetchone() is None:
         persons = [
             ("John Green", "john.green@example.com", "214-555-0101", "Crew Lead"),
             ("Maria Lopez", "maria.lopez@example.com", "214-555-0102", "Mower"),
             ("Sam Patel", "sam.patel@example.com", "214-555-0103", "Spray Tech"),
         ]
-        for name, email, phone, role in persons:
-            cur.execute(
-                """
-                INSERT INTO service_persons (full_name, email, phone, role, is_active)
-                VALUES (?,?,?,?,1)
-                """,
-                (name, email, phone, role),
-            )
-
-    conn.commit()
+        cur.executemany(
+            """
+            INSERT INTO service_persons (full_name, email, phone, role, is_active)
+            VALUES (?,?,?,?,1)
+            """,
+            persons,
+        )
 
     # Seed some service events for current year
     current_year = datetime.date.today().year
-    cur.execute("SELECT COUNT(*) FROM service_events")
-    if cur.fetchone()[0] == 0:
-        # For each property, create some mowing events
+    cur.execute("SELECT 1 FROM service_events LIMIT 1")
+    if cur.fetchone() is None:
+        # For each property, create some mowing events on its first mowing
+        # service (3 completed, 1 scheduled); one INSERT ... SELECT builds
+        # every property's rows inside SQLite.
         cur.execute(
-            "SELECT id FROM properties ORDER BY id"
-        )
-        props = cur.fetchall()
-        for p in props:
-            pid = p["id"]
-            # get mowing service
-            cur.execute(
-                """
-                SELECT id, category FROM property_services
-                WHERE property_id = ? AND category = 'Mowing'
-                LIMIT 1
-                """,
-                (pid,),
+            """
+            WITH mowing AS (
+                SELECT property_id, MIN(id) AS service_id FROM property_services
+                WHERE category = 'Mowing'
+                GROUP BY property_id
+            ),
+            slots (slot, scheduled_date, status) AS (
+                VALUES (1, ?, 'Completed'), (2, ?, 'Completed'), (3, ?, 'Completed'),
+                       (4, ?, 'Scheduled')
             )
-            mowing = cur.fetchone()
-            if mowing:
-                service_id = mowing["id"]
-                # 3 completed, 1 scheduled
-                for i in range(3):
-                    date_str = f"{current_year}-04-{10+i:02d}"
-                    cur.execute(
-                        """
-                        INSERT INTO service_events
-                            (property_id, service_id, service_category, scheduled_date, scheduled_time, status)
-                        VALUES (?,?,?,?,?,?)
-                        """,
-                        (pid, service_id, "Mowing", date_str, "09:00", "Completed"),
-                    )
-                cur.execute(
-                    """
-                    INSERT INTO service_events
-                        (property_id, service_id, service_category, scheduled_date, scheduled_time, status)
-                    VALUES (?,?,?,?,?,?)
-                    """,
-                    (pid, service_id, "Mowing", f"{current_year}-05-01", "09:00", "Scheduled"),
-                )
-
-    conn.commit()
+            INSERT INTO service_events
+                (property_id, service_id, service_category, scheduled_date, scheduled_time, status)
+            SELECT m.property_id, m.service_id, 'Mowing', s.scheduled_date, '09:00', s.status
+            FROM mowing m CROSS JOIN slots s
+            ORDER BY m.property_id, s.slot
+            """,
+            (
+                *(f"{current_year}-04-{10+i:02d}" for i in range(3)),
+                f"{current_year}-05-01",
+            ),
+        )
 
     # Seed a couple of tickets
-    cur.execute("SELECT COUNT(*) FROM tickets")
-    if cur.fetchone()[0] == 0:
-        cur.execute("SELECT id FROM properties ORDER BY id LIMIT 2")
-        props = cur.fetchall()
-        for idx, p in enumerate(props, start=1):
-            pid = p["id"]
-            # get first owner for that property
-            cur.execute(
-                "SELECT id FROM users WHERE role = 'owner' AND property_id = ? LIMIT 1",
-                (pid,),
-            )
-            owner = cur.fetchone()
-            owner_id = owner["id"] if owner else None
-            subject = f"Irrigation concern #{idx}"
-            desc = "Noticed dry patches near the entrance. Please inspect irrigation coverage."
-            cur.execute(
-                """
-                INSERT INTO tickets
-                    (property_id, owner_id, created_by_user_id, subject, description, status, priority, created_at, updated_at)
-                VALUES (?,?,?,?,?,'Open','Medium',?,?)
-                """,
-                (pid, owner_id, owner_id or 1, subject, desc, now, now),
-            )
+    cur.execute("SELECT 1 FROM tickets LIMIT 1")
+    if cur.fetchone() is None:
+        # First two properties with their first owner, in one query. A scalar
+        # subquery rather than a join, so a property with several owners
+        # still yields one row.
+        cur.execute(
+            """
+            SELECT p.id,
+                   (SELECT u.id FROM users u
+                    WHERE u.role = 'owner' AND u.property_id = p.id
+                    ORDER BY u.id LIMIT 1) AS owner_id
+            FROM properties p
+            ORDER BY p.id
+            LIMIT 2
+            """
+        )
+        desc = "Noticed dry patches near the entrance. Please inspect irrigation coverage."
+        ticket_rows = [
+            (p["id"], p["owner_id"], p["owner_id"] or 1, f"Irrigation concern #{idx}", desc, now, now)
+            for idx, p in enumerate(cur.fetchall(), start=1)
+        ]
+        cur.executemany(
+            """
+            INSERT INTO tickets
+                (property_id, owner_id, created_by_user_id, subject, description, status, priority, created_at, updated_at)
+            VALUES (?,?,?,?,?,'Open','Medium',?,?)
+            """,
+            ticket_rows,
+        )
 
+    # PRAGMA doesn't take bound parameters; SCHEMA_VERSION is an int constant
+    cur.execute(f"PRAGMA user_version = {int(SCHEMA_VERSION)}")
     conn.commit()
     conn.close()
+    _get_property_by_id_cached.cache_clear()
+    _invalidate_user_cache()
+
+
+def init_db_once() -> None:
+    """Run init_db() at most once per interpreter for the current DB_PATH."""
+    key = str(DB_PATH)
+    if key in _initialized_paths:
+        return
+    with _init_lock:
+        if key not in _initialized_paths:
+            init_db()
+            _initialized_paths.add(key)
 
 
 # ---------- Generic getters ----------
 
+# (db_path, username) -> (expires_at, row). Only found users are kept, and only
+# for _USER_CACHE_TTL seconds, so writes from another process or direct SQL
+# are picked up within that window.
+_USER_CACHE_TTL = 30.0
+_user_cache: Dict[tuple, tuple] = {}
+_user_cache_lock = threading.Lock()
+
+
 def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
+    """User row by username, memoised for a few seconds.
+
+    Every login and session check goes through here. Writes to ``users`` must
+    call ``_invalidate_user_cache()``. Returns a copy so callers can't mutate
+    the cached row.
+    """
+    key = (str(DB_PATH), username)
+    now = time.monotonic()
+    with _user_cache_lock:
+        hit = _user_cache.get(key)
+    if hit and hit[0] > now:
+        return dict(hit[1])
+
     conn = get_connection()
     cur = conn.cursor()
     cur.execute("SELECT * FROM users WHERE username = ?", (username,))
     row = cur.fetchone()
     conn.close()
-    return dict(row) if row else None
+    if row is None:
+        return None
+    user = dict(row)
+    with _user_cache_lock:
+        if len(_user_cache) >= 512:
+            _user_cache.clear()
+        _user_cache[key] = (now + _USER_CACHE_TTL, user)
+    return dict(user)
+
+
+def _invalidate_user_cache() -> None:
+    with _user_cache_lock:
+        _user_cache.clear()
+
+
+def add_user(username: str, password: str, full_name: str, role: str,
+             property_id: Optional[int] = None) -> int:
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO users (username, password_hash, full_name, role, property_id, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (username, hash_password(password), full_name, role, property_id, _utc_now()),
+    )
+    conn.commit()
+    user_id = cur.lastrowid
+    conn.close()
+    _invalidate_user_cache()
+    return user_id
+
+
+def update_user(user_id: int, full_name: str, role: str, property_id: Optional[int],
+                new_password: Optional[str] = None) -> None:
+    """Update a user's profile; the password only changes when one is given."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE users SET full_name = ?, role = ?, property_id = ? WHERE id = ?",
+        (full_name, role, property_id, user_id),
+    )
+    if new_password:
+        cur.execute(
+            "UPDATE users SET password_hash = ? WHERE id = ?",
+            (hash_password(new_password), user_id),
+        )
+    conn.commit()
+    conn.close()
+    _invalidate_user_cache()
+
+
+def delete_user(user_id: int) -> None:
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM users WHERE id = ?", (user_id,))
+    conn.commit()
+    conn.close()
+    _invalidate_user_cache()
+
+
+def list_users_with_property(role: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Users (optionally of one role) with their property's name joined in.
+
+    Password hashes are left out; these rows feed listings, not logins.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT u.*, p.name AS property_name
+        FROM users u
+        LEFT JOIN properties p ON u.property_id = p.id
+        WHERE ? IS NULL OR u.role = ?
+        ORDER BY u.username
+        """,
+        (role, role),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    users = [dict(r) for r in rows]
+    for u in users:
+        u.pop("password_hash", None)
+    return users
+
+
+def get_property_options() -> List[sqlite3.Row]:
+    """Just ``id`` and ``name`` of every property, for pickers."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT id, name FROM properties ORDER BY name")
+    rows = cur.fetchall()
+    conn.close()
+    return rows
 
 
 def get_all_properties() -> List[Dict[str, Any]]:
@@ -513,7 +848,8 @@ def get_all_properties() -> List[Dict[str, Any]]:
     return [dict(r) for r in rows]
 
 
-def get_property_by_id(property_id: int) -> Optional[Dict[str, Any]]:
+@functools.lru_cache(maxsize=256)
+def _get_property_by_id_cached(db_path: str, property_id: int) -> Optional[Dict[str, Any]]:
     conn = get_connection()
     cur = conn.cursor()
     cur.execute("SELECT * FROM properties WHERE id = ?", (property_id,))
@@ -522,9 +858,18 @@ def get_property_by_id(property_id: int) -> Optional[Dict[str, Any]]:
     return dict(row) if row else None
 
 
+def get_property_by_id(property_id: int) -> Optional[Dict[str, Any]]:
+    """Property row by id, memoised until the next property write.
+
+    Returns a copy so callers can't mutate the cached row.
+    """
+    row = _get_property_by_id_cached(str(DB_PATH), property_id)
+    return dict(row) if row else None
+
+
 def add_property(name: str, address: str, city: str, state: str, zip_code: str,
                  annual_quote: float, annual_credited: float, annual_cost: float) -> int:
-    now = datetime.datetime.utcnow().isoformat(timespec="seconds")
+    now = _utc_now()
     conn = get_connection()
     cur = conn.cursor()
     cur.execute(
@@ -538,12 +883,14 @@ def add_property(name: str, address: str, city: str, state: str, zip_code: str,
     conn.commit()
     pid = cur.lastrowid
     conn.close()
+    # A miss for this id may have been cached before it existed
+    _get_property_by_id_cached.cache_clear()
     return pid
 
 
 def update_property(property_id: int, name: str, address: str, city: str, state: str, zip_code: str,
                     annual_quote: float, annual_credited: float, annual_cost: float) -> None:
-    now = datetime.datetime.utcnow().isoformat(timespec="seconds")
+    now = _utc_now()
     conn = get_connection()
     cur = conn.cursor()
     cur.execute(
@@ -557,6 +904,106 @@ def update_property(property_id: int, name: str, address: str, city: str, state:
     )
     conn.commit()
     conn.close()
+    _get_property_by_id_cached.cache_clear()
+
+
+def get_owner_context_bundle(property_id: int) -> Dict[str, Any]:
+    """Property row, service totals and the service list in one query.
+
+    Used to build the owner's chat context; ``property`` is None if the id
+    doesn't exist.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT p.*,
+               COALESCE((SELECT SUM(times_per_year) FROM property_services
+                         WHERE property_id = p.id), 0) AS total_services,
+               COALESCE((SELECT SUM(times_per_year * each_time_cost) FROM property_services
+                         WHERE property_id = p.id), 0) AS total_cost,
+               (SELECT json_group_array(json_object(
+                           'id', id, 'category', category, 'frequency', frequency,
+                           'times_per_year', times_per_year,
+                           'each_time_cost', each_time_cost, 'notes', notes,
+                           'total_cost', total_cost))
+                FROM (SELECT * FROM v_property_services
+                      WHERE property_id = p.id ORDER BY category)) AS services_json
+        FROM properties p
+        WHERE p.id = ?
+        """,
+        (property_id,),
+    )
+    row = cur.fetchone()
+    conn.close()
+    if not row:
+        return {"property": None, "total_services": 0, "total_cost": 0.0, "services": []}
+
+    prop = dict(row)
+    total_services = prop.pop("total_services")
+    total_cost = prop.pop("total_cost")
+    services = json.loads(prop.pop("services_json") or "[]")
+    return {
+        "property": prop,
+        "total_services": total_services,
+        "total_cost": float(total_cost),
+        "services": services,
+    }
+
+
+def get_properties_summary() -> List[Dict[str, Any]]:
+    """Every property with its service count and annual cost, for the portfolio tables."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT p.id, p.name, p.annual_quote, p.annual_credited,
+               COALESCE(SUM(s.times_per_year), 0) AS total_services,
+               COALESCE(SUM(s.total_cost), 0.0) AS total_cost
+        FROM properties p
+        LEFT JOIN v_property_services s ON s.property_id = p.id
+        GROUP BY p.id
+        ORDER BY p.name
+        """
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def get_frequency_summary() -> List[Dict[str, Any]]:
+    """Planned visits across all properties, grouped by service frequency."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT frequency, SUM(times_per_year) AS total_services
+        FROM property_services
+        GROUP BY frequency
+        ORDER BY frequency
+        """
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def get_property_summary(property_id: int) -> Dict[str, Any]:
+    """Service count and annual cost for one property (zeros if it has none)."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT COALESCE(SUM(times_per_year), 0) AS total_services,
+               COALESCE(SUM(total_cost), 0.0) AS total_cost
+        FROM v_property_services
+        WHERE property_id = ?
+        """,
+        (property_id,),
+    )
+    row = cur.fetchone()
+    conn.close()
+    return dict(row)
 
 
 # ---------- Property services ----------
@@ -565,7 +1012,7 @@ def get_services_for_property(property_id: int) -> List[Dict[str, Any]]:
     conn = get_connection()
     cur = conn.cursor()
     cur.execute(
-        "SELECT * FROM property_services WHERE property_id = ? ORDER BY category",
+        "SELECT * FROM v_property_services WHERE property_id = ? ORDER BY category",
         (property_id,),
     )
     rows = cur.fetchall()
@@ -573,6 +1020,42 @@ def get_services_for_property(property_id: int) -> List[Dict[str, Any]]:
     return [dict(r) for r in rows]
 
 
+def get_all_services_with_property() -> List[sqlite3.Row]:
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT s.*, p.name AS property_name
+        FROM v_property_services s
+        JOIN properties p ON s.property_id = p.id
+        ORDER BY p.name, s.category
+        """
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def iter_services_with_property(chunksize: int = 5000) -> Iterator[sqlite3.Row]:
+    """Yield every service with its property name, fetched ``chunksize`` rows at a time."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT s.*, p.name AS property_name
+        FROM v_property_services s
+        JOIN properties p ON s.property_id = p.id
+        ORDER BY p.name, s.category
+        """
+    )
+    try:
+        while rows := cur.fetchmany(chunksize):
+            yield from rows
+    finally:
+        cur.close()
+        conn.close()
+
+
 def add_property_service(property_id: int, category: str, frequency: str,
                          times_per_year: int, each_time_cost: float, notes: str) -> int:
     conn = get_connection()
@@ -615,6 +1098,59 @@ def delete_property_service(service_id: int) -> None:
     conn.close()
 
 
+def add_service_attachments_bulk(rows: List[tuple]) -> None:
+    """Insert (service_id, file_name, file_path, uploaded_by) rows in one transaction."""
+    if not rows:
+        return
+    now = _utc_now()
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.executemany(
+        """
+        INSERT INTO service_attachments
+            (service_id, file_name, file_path, uploaded_by, uploaded_at)
+        VALUES (?,?,?,?,?)
+        """,
+        [(*row, now) for row in rows],
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_service_attachments(service_id: int) -> List[Dict[str, Any]]:
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT * FROM service_attachments WHERE service_id = ? ORDER BY uploaded_at DESC, id DESC",
+        (service_id,),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def get_attachments_for_property(property_id: int) -> Dict[int, List[Dict[str, Any]]]:
+    """All service attachments for a property in one query, grouped by service id."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT a.service_id, a.file_name, a.uploaded_at, a.uploaded_by, a.file_path
+        FROM service_attachments a
+        JOIN property_services ps ON ps.id = a.service_id
+        WHERE ps.property_id = ?
+        ORDER BY a.service_id, a.uploaded_at DESC, a.id DESC
+        """,
+        (property_id,),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return {
+        sid: [dict(r) for r in group]
+        for sid, group in itertools.groupby(rows, key=lambda r: r["service_id"])
+    }
+
+
 # ---------- Service personnel ----------
 
 def get_all_service_persons() -> List[Dict[str, Any]]:
@@ -743,6 +1279,11 @@ def add_service_event(property_id: int, service_id: Optional[int], provider_id:
 
 
 def get_scheduled_events(from_date: str, to_date: str) -> List[Dict[str, Any]]:
+    """Events in a date range with property name and provider contact joined in.
+
+    Reminder senders read ``provider_email``/``provider_phone`` straight off
+    these rows, so no per-event personnel lookup is needed.
+    """
     conn = get_connection()
     cur = conn.cursor()
     cur.execute(
@@ -781,7 +1322,7 @@ def update_service_event_status(event_id: int, status: str,
 
 
 def touch_service_event_reminder(event_id: int) -> None:
-    now = datetime.datetime.utcnow().isoformat(timespec="seconds")
+    now = _utc_now()
     conn = get_connection()
     cur = conn.cursor()
     cur.execute(
@@ -812,6 +1353,11 @@ def get_events_for_property(property_id: int) -> List[Dict[str, Any]]:
     return [dict(r) for r in rows]
 
 
+def _year_bounds(year: int) -> tuple:
+    """``[start, end)`` ISO date bounds for ``year``; a range scan can use an index."""
+    return f"{year:04d}-01-01", f"{year + 1:04d}-01-01"
+
+
 def get_service_fulfilment_for_property(property_id: int, year: int) -> List[Dict[str, Any]]:
     """Return per-service fulfilment stats for a property and year."""
     conn = get_connection()
@@ -822,26 +1368,31 @@ def get_service_fulfilment_for_property(property_id: int, year: int) -> List[Dic
     )
     services = cur.fetchall()
 
+    # Event counts for every service of the property in one grouped query
+    cur.execute(
+        """
+        SELECT
+            service_id,
+            SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) AS completed,
+            SUM(CASE WHEN status = 'Scheduled' THEN 1 ELSE 0 END) AS scheduled
+        FROM service_events
+        WHERE property_id = ?
+          AND scheduled_date >= ? AND scheduled_date < ?
+        GROUP BY service_id
+        """,
+        (property_id, *_year_bounds(year)),
+    )
+    counts = {r["service_id"]: r for r in cur.fetchall()}
+    conn.close()
+
     results = []
     for s in services:
         sid = s["id"]
         planned = s["times_per_year"] or 0
 
-        cur.execute(
-            """
-            SELECT
-                SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) AS completed,
-                SUM(CASE WHEN status = 'Scheduled' THEN 1 ELSE 0 END) AS scheduled
-            FROM service_events
-            WHERE property_id = ?
-              AND service_id = ?
-              AND substr(scheduled_date,1,4) = ?
-            """,
-            (property_id, sid, str(year)),
-        )
-        r = cur.fetchone()
-        completed = r["completed"] or 0
-        scheduled = r["scheduled"] or 0
+        r = counts.get(sid)
+        completed = (r["completed"] or 0) if r else 0
+        scheduled = (r["scheduled"] or 0) if r else 0
         pending = max(planned - completed, 0)
         completion_pct = (completed / planned * 100.0) if planned > 0 else None
 
@@ -858,20 +1409,47 @@ def get_service_fulfilment_for_property(property_id: int, year: int) -> List[Dic
             }
         )
 
-    conn.close()
     return results
 
 
 def get_portfolio_fulfilment(year: int) -> List[Dict[str, Any]]:
+    """Planned vs completed visits per property for a year, in one query.
+
+    Services and completed events are aggregated separately before joining,
+    so a property's planned total isn't multiplied by its event count.
+    """
     conn = get_connection()
     cur = conn.cursor()
-    cur.execute("SELECT id, name FROM properties")
+    cur.execute(
+        """
+        SELECT p.id, p.name,
+               COALESCE(s.planned, 0) AS planned,
+               COALESCE(e.completed, 0) AS completed
+        FROM properties p
+        LEFT JOIN (
+            SELECT property_id, SUM(times_per_year) AS planned
+            FROM property_services
+            GROUP BY property_id
+        ) s ON s.property_id = p.id
+        LEFT JOIN (
+            SELECT se.property_id, COUNT(*) AS completed
+            FROM service_events se
+            JOIN property_services ps
+              ON ps.id = se.service_id AND ps.property_id = se.property_id
+            WHERE se.status = 'Completed'
+              AND se.scheduled_date >= ? AND se.scheduled_date < ?
+            GROUP BY se.property_id
+        ) e ON e.property_id = p.id
+        ORDER BY p.id
+        """,
+        _year_bounds(year),
+    )
     props = cur.fetchall()
+    conn.close()
     rows = []
     for p in props:
-        pf = get_service_fulfilment_for_property(p["id"], year)
-        total_planned = sum(s["times_per_year"] or 0 for s in pf)
-        total_completed = sum(s["completed_count"] or 0 for s in pf)
+        total_planned = p["planned"]
+        total_completed = p["completed"]
         total_pending = max(total_planned - total_completed, 0)
         completion_pct = (total_completed / total_planned * 100.0) if total_planned > 0 else None
 
@@ -896,7 +1474,6 @@ def get_portfolio_fulfilment(year: int) -> List[Dict[str, Any]]:
                 "status": status,
             }
         )
-    conn.close()
     return rows
 
 
@@ -920,6 +1497,25 @@ def get_tickets_for_owner(owner_id: int) -> List[Dict[str, Any]]:
     return [dict(r) for r in rows]
 
 
+def get_tickets_for_property(property_id: int) -> List[sqlite3.Row]:
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT t.*, p.name AS property_name, u.full_name AS owner_name
+        FROM tickets t
+        JOIN properties p ON t.property_id = p.id
+        LEFT JOIN users u ON t.owner_id = u.id
+        WHERE t.property_id = ?
+        ORDER BY t.created_at DESC
+        """,
+        (property_id,),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
 def get_all_tickets() -> List[Dict[str, Any]]:
     conn = get_connection()
     cur = conn.cursor()
@@ -939,7 +1535,7 @@ def get_all_tickets() -> List[Dict[str, Any]]:
 
 def add_ticket(property_id: int, owner_id: Optional[int], created_by_user_id: int,
                subject: str, description: str, priority: str) -> int:
-    now = datetime.datetime.utcnow().isoformat(timespec="seconds")
+    now = _utc_now()
     conn = get_connection()
     cur = conn.cursor()
     cur.execute(
@@ -959,7 +1555,7 @@ def add_ticket(property_id: int, owner_id: Optional[int], created_by_user_id: in
 
 
 def update_ticket_status(ticket_id: int, status: str, priority: str, description: Optional[str]) -> None:
-    now = datetime.datetime.utcnow().isoformat(timespec="seconds")
+    now = _utc_now()
     conn = get_connection()
     cur = conn.cursor()
     if description is not None:
@@ -986,7 +1582,7 @@ def update_ticket_status(ticket_id: int, status: str, priority: str, description
 
 def add_ticket_attachment(ticket_id: int, filename: str, stored_path: str,
                           mime_type: str, size_bytes: int) -> None:
-    now = datetime.datetime.utcnow().isoformat(timespec="seconds")
+    now = _utc_now()
     conn = get_connection()
     cur = conn.cursor()
     cur.execute(
@@ -1013,6 +1609,35 @@ def get_attachments_for_ticket(ticket_id: int) -> List[Dict[str, Any]]:
     return [dict(r) for r in rows]
 
 
+def get_attachments_for_tickets(ticket_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Attachments for several tickets, grouped by ticket id.
+
+    Lets a ticket list render every expander from one query instead of one
+    ``get_attachments_for_ticket`` call per ticket. Ids are bound in chunks
+    to stay under SQLite's bound-parameter limit.
+    """
+    grouped: Dict[int, List[Dict[str, Any]]] = {tid: [] for tid in ticket_ids}
+    if not ticket_ids:
+        return grouped
+    ids = list(grouped)
+    conn = get_connection()
+    cur = conn.cursor()
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        cur.execute(
+            f"""
+            SELECT * FROM ticket_attachments
+            WHERE ticket_id IN ({",".join("?" * len(chunk))})
+            ORDER BY uploaded_at DESC, id DESC
+            """,
+            chunk,
+        )
+        for r in cur.fetchall():
+            grouped[r["ticket_id"]].append(dict(r))
+    conn.close()
+    return grouped
+
+
 # ---------- Counts for dashboard ----------
 
 def count_open_tickets() -> int:
@@ -1057,15 +1682,83 @@ def count_price_master_entries() -> int:
     return n
 
 
+def get_dashboard_counts(today_iso: str) -> Dict[str, int]:
+    """The four module-health counts above in one statement (one pool checkout)."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM tickets WHERE status = 'Open') AS open_tickets,
+            (SELECT COUNT(*) FROM service_events
+             WHERE status = 'Scheduled' AND scheduled_date < ?) AS overdue_events,
+            (SELECT COUNT(*) FROM service_persons WHERE is_active = 1) AS active_persons,
+            (SELECT COUNT(*) FROM price_master) AS price_entries
+        """,
+        (today_iso,),
+    )
+    counts = dict(cur.fetchone())
+    conn.close()
+    return counts
+
+
+def get_portfolio_totals() -> Dict[str, Any]:
+    """Portfolio-wide headline figures in one statement.
+
+    Service totals come from ``v_property_services`` and revenue from
+    ``properties``; they are summed separately so the join can't double count.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM properties) AS total_properties,
+            (SELECT COALESCE(SUM(times_per_year), 0) FROM v_property_services) AS total_services,
+            (SELECT COALESCE(SUM(total_cost), 0.0) FROM v_property_services) AS total_cost,
+            (SELECT COALESCE(SUM(annual_quote), 0.0) FROM properties) AS total_quoted,
+            (SELECT COALESCE(SUM(annual_credited), 0.0) FROM properties) AS total_credited
+        """
+    )
+    totals = dict(cur.fetchone())
+    conn.close()
+    totals["total_margin"] = totals["total_credited"] - totals["total_cost"]
+    return totals
+
+
+def get_report_data_version() -> str:
+    """Cheap fingerprint of the tables behind the consolidated report.
+
+    Row counts plus the newest ``updated_at`` per table. ``property_services``
+    and ``users`` have no timestamp, so they contribute their newest id and,
+    for services, the summed annual cost instead.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) || ':' || IFNULL(MAX(updated_at), '') FROM properties),
+            (SELECT COUNT(*) || ':' || IFNULL(MAX(id), 0) || ':'
+                    || TOTAL(times_per_year * each_time_cost) FROM property_services),
+            (SELECT COUNT(*) || ':' || IFNULL(MAX(id), 0) FROM users),
+            (SELECT COUNT(*) || ':' || IFNULL(MAX(updated_at), '') FROM tickets)
+        """
+    )
+    version = "|".join(cur.fetchone())
+    conn.close()
+    return version
+
+
 # ---------- Regions & quoting ----------
 
-def get_regions() -> List[Dict[str, Any]]:
+def get_regions() -> List[sqlite3.Row]:
     conn = get_connection()
     cur = conn.cursor()
     cur.execute("SELECT * FROM regions ORDER BY state, city, property_type")
     rows = cur.fetchall()
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
 def get_region_by_id(region_id: int) -> Optional[Dict[str, Any]]:
@@ -1156,7 +1849,7 @@ def add_quote(
     _ensure_quote_tables()
     conn = get_connection()
     cur = conn.cursor()
-    now = datetime.datetime.utcnow().isoformat(timespec="seconds")
+    now = _utc_now()
 
     cur.execute(
         """
@@ -1256,7 +1949,7 @@ def convert_quote_to_property(quote_id: int) -> Optional[int]:
 
     conn = get_connection()
     cur = conn.cursor()
-    now = datetime.datetime.utcnow().isoformat(timespec="seconds")
+    now = _utc_now()
 
     # region_label format is expected like "TX - Frisco - Small Industrial"
     state = ""
@@ -1318,4 +2011,5 @@ def convert_quote_to_property(quote_id: int) -> Optional[int]:
 
     conn.commit()
     conn.close()
+    _get_property_by_id_cached.cache_clear()
     return property_id
@@ -42,11 +42,12 @@ def show(user: Dict[str, Any]) -> None:
     # Module health overview
     st.subheader("Module Health Overview")
 
-    open_tickets = db.count_open_tickets()
     today_str = datetime.date.today().isoformat()
-    overdue_events = db.count_overdue_events(today_str)
-    active_persons = db.count_active_service_persons()
-    price_entries = db.count_price_master_entries()
+    counts = db.get_dashboard_counts(today_str)
+    open_tickets = counts["open_tickets"]
+    overdue_events = counts["overdue_events"]
+    active_persons = counts["active_persons"]
+    price_entries = counts["price_entries"]
 
     c1, c2, c3, c4 = st.columns(4)
 
@@ -39,6 +39,8 @@ def show(user: Dict[str, Any]) -> None:
     upload_root = Path("uploads")
     upload_root.mkdir(exist_ok=True)
 
+    attachments_by_ticket = db.get_attachments_for_tickets([t["id"] for t in tickets])
+
     for t in tickets:
         with st.expander(f"[#{t['id']}] {t['subject']} — {t['property_name']}", expanded=False):
             st.write(f"**Property:** {t['property_name']}")
@@ -84,7 +86,7 @@ def show(user: Dict[str, Any]) -> None:
 
             # Attachments
             st.markdown("#### Attachments")
-            attachments = db.get_attachments_for_ticket(t["id"])
+            attachments = attachments_by_ticket[t["id"]]
             if attachments:
                 for a in attachments:
                     st.write(
@@ -65,6 +65,7 @@ def show(user: Dict[str, Any]) -> None:
     if tickets:
         st.markdown("---")
         st.markdown("### Ticket Details")
+        attachments_by_ticket = db.get_attachments_for_tickets([t["id"] for t in tickets])
         for t in tickets:
             with st.expander(f"[#{t['id']}] {t['subject']}", expanded=False):
                 st.write(f"**Status:** {t['status']}")
@@ -73,7 +74,7 @@ def show(user: Dict[str, Any]) -> None:
                 st.write(t["description"])
 
                 st.markdown("#### Attachments")
-                attachments = db.get_attachments_for_ticket(t["id"])
+                attachments = attachments_by_ticket[t["id"]]
                 if attachments:
                     for a in attachments:
                         st.write(
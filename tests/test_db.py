@@ -0,0 +1,26 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import db
+
+
+class ReportDataVersionTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db.DB_PATH
+        db.DB_PATH = Path(self._tmp.name) / "fresh.db"
+
+    def tearDown(self):
+        db.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_fresh_database(self):
+        db.init_db()
+        version = db.get_report_data_version()
+        self.assertEqual(len(version.split("|")), 4)
+        self.assertEqual(version, db.get_report_data_version())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+
+import os
+import threading
+from typing import Dict, Optional
+
+import streamlit as st
+
+# Settings found so far. Unset keys are not remembered, so a secret added
+# while the app is running is picked up on the next lookup.
+_found: Dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def get_secret(name: str) -> Optional[str]:
+    """Read a setting from st.secrets, falling back to the environment.
+
+    Values that are found are kept for the life of the process: the
+    notification helpers look up several keys per message.
+    """
+    with _lock:
+        if name in _found:
+            return _found[name]
+    val: Optional[str] = None
+    try:
+        secret = st.secrets.get(name)  # type: ignore[attr-defined]
+        if secret:
+            val = str(secret)
+    except Exception:
+        pass
+    if val is None:
+        val = os.getenv(name)
+    if val is not None:
+        with _lock:
+            _found[name] = val
+    return val